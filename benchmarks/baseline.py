@@ -0,0 +1,63 @@
+"""
+Références de performance : lecture / écriture de benchmarks/baseline.json
+et détection des régressions au-delà d'un seuil relatif.
+"""
+import json
+import os
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Métriques comparées (plus petit = meilleur)
+METRICS = ("seconds", "peak_mb")
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Fusionne `results` ({nom: {métrique: valeur}}) dans le fichier de référence."""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Liste des régressions : (nom, métrique, référence, mesure) pour chaque
+    métrique qui dépasse la référence de plus de `threshold` (relatif).
+    """
+    regressions = []
+    for name, metrics in results.items():
+        ref = baseline.get(name)
+        if not ref:
+            continue
+        for metric in METRICS:
+            if metric in metrics and ref.get(metric):
+                if metrics[metric] > ref[metric] * (1 + threshold):
+                    regressions.append((name, metric, ref[metric], metrics[metric]))
+    return regressions
+
+
+def print_report(results, baseline, regressions):
+    for name, metrics in results.items():
+        ref = baseline.get(name, {})
+        cols = []
+        for metric in METRICS:
+            if metric in metrics:
+                old = ref.get(metric)
+                delta = f" ({metrics[metric] / old - 1:+.0%})" if old else ""
+                cols.append(f"{metric}={metrics[metric]:.4g}{delta}")
+        for key, value in metrics.items():
+            if key not in METRICS:
+                cols.append(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}")
+        print(f"{name:45s} " + "  ".join(cols))
+
+    for name, metric, old, new in regressions:
+        print(f"RÉGRESSION {name} : {metric} {old:.4g} -> {new:.4g}")
@@ -0,0 +1,83 @@
+"""
+Temps d'import des points d'entrée (GUI, CLI, modules de calcul).
+
+    python -m benchmarks.bench_import                    # compare à la référence
+    python -m benchmarks.bench_import --update-baseline  # enregistre la référence
+
+Chaque import est mesuré dans un interpréteur neuf (meilleur de --repeat
+essais). Le script échoue aussi si un point d'entrée charge une dépendance
+lourde qu'il doit différer (ex. pandas ou matplotlib pour la GUI).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.baseline import compare, load_baseline, print_report, save_baseline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> dépendances qui ne doivent pas être chargées à l'import
+TARGETS = {
+    "gui": ["pandas", "scipy", "matplotlib", "reportlab"],
+    "cli": ["tkinter", "pandas", "scipy", "matplotlib", "reportlab"],
+    "data.preprocess": ["scipy", "matplotlib"],
+    "simulation.optimize": ["scipy", "pandas", "matplotlib"],
+    "simulation.aep": ["scipy", "pandas", "matplotlib"],
+    "reporting.pdf_generator": ["matplotlib", "tkinter"],
+}
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t
+print(json.dumps({{"seconds": dt, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, forbidden, repeat=5):
+    best, loaded = None, []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, forbidden=forbidden)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        res = json.loads(out.stdout.strip().splitlines()[-1])
+        best = res["seconds"] if best is None else min(best, res["seconds"])
+        loaded = res["loaded"]
+    return best, loaded
+
+
+def run(repeat=5):
+    results, violations = {}, []
+    for module, forbidden in TARGETS.items():
+        seconds, loaded = measure(module, forbidden, repeat)
+        results[f"import:{module}"] = {"seconds": seconds}
+        violations += [(module, m) for m in loaded]
+    return results, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25, help="régression relative tolérée")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results, violations = run(args.repeat)
+    baseline = load_baseline()
+    regressions = compare(results, baseline, args.threshold)
+    print_report(results, baseline, regressions)
+
+    for module, dep in violations:
+        print(f"IMPORT ANTICIPÉ {module} charge {dep}")
+
+    if args.update_baseline:
+        save_baseline(results)
+    return 1 if (regressions or violations) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
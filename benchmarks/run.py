@@ -0,0 +1,238 @@
+"""
+Suite de benchmarks WindLab : chargement, prétraitement, sillages,
+Monte-Carlo et optimiseur, sur des données synthétiques de taille croissante.
+
+    python -m benchmarks.run                              # toutes les suites, tailles "small"
+    python -m benchmarks.run --suite loader wake --sizes medium
+    python -m benchmarks.run --update-baseline            # enregistre la référence locale
+    python -m benchmarks.run --json results.json
+
+Pour chaque cas : temps (meilleur de --repeat), débit (éléments/s) et pic
+mémoire Python/numpy (tracemalloc, mesuré dans un passage séparé). Chaque
+suite affiche aussi l'exposant de passage à l'échelle (pente log-log du temps
+en fonction de la taille). Les cas qui dépassent la référence de plus de
+--threshold sont signalés et le code de retour vaut 1.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.baseline import compare, load_baseline, print_report, save_baseline
+from benchmarks import synthetic
+
+SIZES = {
+    "small": [10**4, 10**5],
+    "medium": [10**4, 10**5, 10**6, 10**7],
+    "large": [10**4, 10**5, 10**6, 10**7, 10**8],
+}
+
+
+# ---------- Cas de benchmark ----------
+# Chaque suite est une fonction (taille, dossier temporaire) -> (fonction à
+# mesurer, nombre d'éléments traités), pour les tailles qui la concernent.
+
+def suite_loader(n, tmp):
+    from data.loader import load_labview_txt, cache_path
+    path = os.path.join(tmp, f"bench_{n}.txt")
+    if not os.path.exists(path):
+        synthetic.write_lvm(path, n)
+
+    def cold():
+        cached = cache_path(path)
+        if cached:
+            os.remove(cached)
+        load_labview_txt(path)
+
+    return {
+        "parse": (cold, n),
+        "cached": (lambda: load_labview_txt(path), n),
+        "parse_nocache": (lambda: load_labview_txt(path, use_cache=False), n),
+    }
+
+
+def suite_stream(n, tmp):
+    from data.loader import iter_labview_blocks
+    from utils.math_tools import RunningStats
+    path = os.path.join(tmp, f"bench_{n}.txt")
+    if not os.path.exists(path):
+        synthetic.write_lvm(path, n)
+
+    def run():
+        stats = RunningStats()
+        for block in iter_labview_blocks(path, chunk_size=100_000):
+            stats.update(block["lum"])
+
+    return {"welford": (run, n)}
+
+
+def suite_preprocess(n, tmp):
+    from data.preprocess import fft_filter, compute_spectrogram, iter_fft_filter
+    _, _, sig = synthetic.lvm_signals(n)
+
+    def blocks():
+        for _ in iter_fft_filter((sig[i:i + 100_000] for i in range(0, n, 100_000)), 1000, 0.2, 3):
+            pass
+
+    return {
+        "fft_filter": (lambda: fft_filter(sig, 1000, 0.2, 3), n),
+        "fft_filter_pad": (lambda: fft_filter(sig, 1000, 0.2, 3, pad=True), n),
+        "overlap_save": (blocks, n),
+        "spectrogram": (lambda: compute_spectrogram(sig, 1000), n),
+    }
+
+
+def suite_wake(n, tmp):
+    from physics.wake_bastankhah import bastankhah
+    from physics.wake_jensen import jensen
+    side = int(np.sqrt(n))
+    x, r = np.meshgrid(np.linspace(-200, 3000, side), np.linspace(-400, 400, side))
+    return {
+        "bastankhah_grid": (lambda: bastankhah(8.0, 0.7, x, r, 100), side * side),
+        "jensen_grid": (lambda: jensen(8.0, 0.7, x, 100, r=r), side * side),
+    }
+
+
+def suite_farm(n, tmp):
+    from simulation.farm import farm_power
+    # n échantillons -> parc de ~sqrt(n)/2 turbines (10^4 -> 50, 10^6 -> 500)
+    n_turbines = max(2, int(np.sqrt(n) / 2))
+    xs, ys = synthetic.grid_layout(n_turbines)
+    directions = np.arange(0, 360, 10)
+    pairs = n_turbines**2 * len(directions)
+    return {
+        "farm_power_36dir": (lambda: farm_power(xs, ys, 8.0, directions), pairs),
+        "farm_power_36dir_ti": (lambda: farm_power(xs, ys, 8.0, directions, I0=0.06), pairs),
+    }
+
+
+def suite_montecarlo(n, tmp):
+    from simulation.montecarlo import mc_from_signals, mc_summary, spacing_sweep
+    _, _, p1 = synthetic.lvm_signals(10_000, seed=1)
+    _, _, p2 = synthetic.lvm_signals(10_000, seed=2)
+    # Balayage : 14 distances x ~n/14 scénarios au total (16 répétitions,
+    # puissance de 2 par répétition pour Sobol)
+    per_rep = 2**max(1, int(np.log2(max(n // (14 * 16), 2))))
+    cases = {
+        "mc_summary": (lambda: mc_summary(p1, p2, N=n, seed=0), n),
+        "spacing_sweep_sobol": (lambda: spacing_sweep(8.0, 1.0, n_samples=per_rep, lateral_std=0.5, seed=0),
+                                14 * 16 * per_rep),
+    }
+    if n <= 10**7:
+        cases["mc_from_signals"] = (lambda: mc_from_signals(p1, p2, N=n, seed=0), n)
+    return cases
+
+
+def suite_optimizer(n, tmp):
+    from simulation.optimize import optimize_layout, optimize_two_turbines
+    # n -> budget d'évaluations (plafonné : l'optimiseur est le cas le plus lent)
+    evals = min(n, 20_000)
+    return {
+        "two_turbines": (lambda: optimize_two_turbines(2.0, 0.05, iterations=evals, seed=0), evals),
+        "layout_10wt_12dir": (lambda: optimize_layout(10, 8.0, 0.5, directions=np.arange(0, 360, 30),
+                                                      max_evals=evals, seed=0), evals),
+    }
+
+
+SUITES = {
+    "loader": suite_loader,
+    "stream": suite_stream,
+    "preprocess": suite_preprocess,
+    "wake": suite_wake,
+    "farm": suite_farm,
+    "montecarlo": suite_montecarlo,
+    "optimizer": suite_optimizer,
+}
+
+
+# ---------- Mesure ----------
+def time_best(fn, repeat):
+    fn()  # échauffement : imports différés, caches, allocations
+    best = np.inf
+    for _ in range(repeat):
+        gc.collect()
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def peak_memory(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def scaling_exponent(sizes, seconds):
+    """Pente log-log temps / taille (1 = linéaire)."""
+    if len(sizes) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+
+def run(suites, sizes, repeat=3, memory=True, tmp=None):
+    results = {}
+    curves = {}
+    with tempfile.TemporaryDirectory(prefix="windlab_bench_", dir=tmp) as tmpdir:
+        for suite in suites:
+            for n in sizes:
+                for case, (fn, count) in SUITES[suite](n, tmpdir).items():
+                    name = f"{suite}:{case}:{n:.0e}"
+                    seconds = time_best(fn, repeat)
+                    res = {"seconds": seconds, "throughput": count / seconds}
+                    if memory:
+                        res["peak_mb"] = peak_memory(fn)
+                    results[name] = res
+                    curves.setdefault(f"{suite}:{case}", []).append((count, seconds))
+                    print(f"  {name:45s} {seconds:9.4f} s", file=sys.stderr)
+
+    scaling = {
+        name: scaling_exponent([c for c, _ in pts], [s for _, s in pts])
+        for name, pts in curves.items()
+    }
+    return results, scaling
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--sizes", choices=list(SIZES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire")
+    parser.add_argument("--threshold", type=float, default=0.25, help="régression relative tolérée")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", help="écrit les résultats et les pentes dans ce fichier")
+    parser.add_argument("--tmp", help="dossier des fichiers synthétiques (grandes tailles)")
+    args = parser.parse_args(argv)
+
+    results, scaling = run(args.suite, SIZES[args.sizes], args.repeat, not args.no_memory, args.tmp)
+
+    baseline = load_baseline()
+    regressions = compare(results, baseline, args.threshold)
+    print_report(results, baseline, regressions)
+
+    print("\nPassage à l'échelle (pente log-log, 1 = linéaire)")
+    for name, slope in scaling.items():
+        if slope is not None:
+            print(f"  {name:45s} {slope:5.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "scaling": scaling}, f, indent=2)
+    if args.update_baseline:
+        save_baseline(results)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
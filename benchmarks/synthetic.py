@@ -0,0 +1,75 @@
+"""
+Données synthétiques pour les benchmarks : fichiers LabVIEW (.txt) au
+format des captures de soufflerie, campagnes P1/P2 et parcs éoliens.
+"""
+import os
+
+import numpy as np
+
+LVM_HEADER = (
+    "LabVIEW Measurement\t\n"
+    "Writer_Version\t2\n"
+    "Reader_Version\t2\n"
+    "Separator\tTab\n"
+    "Decimal_Separator\t,\n"
+    "***End_of_Header***\t\n"
+    "\n"
+    "Channels\t2\t\n"
+    "Samples\t1\t1\n"
+    "X_Dimension\tTime\tTime\n"
+    "***End_of_Header***\t\n"
+    "X_Value\tGenerateur\tLumiere\tComment\n"
+)
+
+
+def lvm_signals(n, fs=1000, seed=0, start=0):
+    """Signaux t, gen, lum plausibles (sinusoïde de sillage + bruit)."""
+    rng = np.random.default_rng([seed, start])
+    t = (start + np.arange(n)) / fs
+    gen = 0.68 + 0.01 * rng.standard_normal(n)
+    lum = 2.0 + 0.3 * np.sin(2 * np.pi * 1.5 * t) + 0.05 * rng.standard_normal(n)
+    return t, gen, lum
+
+
+def write_lvm(path, n, fs=1000, seed=0, chunk=1_000_000):
+    """Écrit un fichier LabVIEW de n lignes (par blocs : n peut dépasser la RAM)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(LVM_HEADER)
+        for start in range(0, n, chunk):
+            t, gen, lum = lvm_signals(min(chunk, n - start), fs, seed, start)
+            block = np.column_stack([t, gen, lum])
+            lines = "\n".join("\t".join(row) for row in np.char.mod("%.6f", block)) + "\n"
+            f.write(lines.replace(".", ","))
+    return path
+
+
+def make_campaign(directory, n_runs=4, n=10_000, fs=1000):
+    """Crée un dossier de campagne 'Run_XX k P1.txt' / 'Run_XX k P2.txt'."""
+    os.makedirs(directory, exist_ok=True)
+    for k in range(1, n_runs + 1):
+        for turbine, offset in (("P1", 0), ("P2", 1000)):
+            path = os.path.join(directory, f"Run_34 {k} {turbine}.txt")
+            if not os.path.exists(path):
+                write_lvm(path, n, fs, seed=k + offset)
+    return directory
+
+
+def random_layout(n, terrain_size=2000, min_dist=200, seed=0, max_tries=100_000):
+    """n positions aléatoires respectant un espacement minimal (tirage par rejet)."""
+    rng = np.random.default_rng(seed)
+    pts = []
+    for _ in range(max_tries):
+        p = rng.uniform(0, terrain_size, 2)
+        if all(np.hypot(*(p - q)) >= min_dist for q in pts):
+            pts.append(p)
+            if len(pts) == n:
+                break
+    pts = np.array(pts)
+    return pts[:, 0], pts[:, 1]
+
+
+def grid_layout(n, spacing=500):
+    """n turbines sur une grille carrée d'espacement `spacing`."""
+    side = int(np.ceil(np.sqrt(n)))
+    ix, iy = np.divmod(np.arange(n), side)
+    return ix * float(spacing), iy * float(spacing)
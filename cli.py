@@ -0,0 +1,387 @@
+"""
+WindLab en ligne de commande (sans interface graphique) :
+
+    python cli.py ingest     DOSSIER
+    python cli.py filter     DOSSIER --fmin 0.2 --fmax 3
+    python cli.py spectrum   DOSSIER --nperseg 1024
+    python cli.py correlate  DOSSIER --max-lag 5 --fmin 0.1 --fmax 2
+    python cli.py montecarlo DOSSIER --run 1 -N 10000000
+    python cli.py sweep      --U0 8 --sigma 1 --model jensen
+    python cli.py optimize   --turbines 2 --U0 2.0 --variance 0.05
+    python cli.py report     DOSSIER --out rapport.pdf
+
+Les modules lourds ne sont importés que par la sous-commande qui en a besoin ;
+tkinter et le backend TkAgg ne sont jamais chargés. `--profile` (avant la
+sous-commande) affiche le temps passé dans les fonctions instrumentées ;
+`--profile-mode cprofile` / `--profile-mode memory` y ajoutent cProfile et
+tracemalloc.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ---------- Sorties ----------
+def _jsonable(obj):
+    import numpy as np
+
+    if isinstance(obj, dict):
+        return {str(k): _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return _jsonable(obj.tolist())
+    if isinstance(obj, (complex, np.complexfloating)):
+        return [float(obj.real), float(obj.imag)]  # JSON n'a pas de complexes
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def write_json(obj, path):
+    text = json.dumps(_jsonable(obj), indent=2)
+    if path in (None, "-"):
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+def write_table(columns, path, fmt):
+    """Écrit un dict {colonne: array} en CSV, Parquet (pyarrow requis) ou JSON."""
+    if fmt in ("csv", "parquet"):
+        import pandas as pd
+        df = pd.DataFrame(columns)
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False)
+    else:
+        write_json(columns, path)
+    return path
+
+
+def check_format(fmt):
+    """Échoue tôt (avant de lancer les processus) si Parquet n'est pas disponible."""
+    if fmt != "parquet":
+        return
+    import importlib.util
+    if not any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet")):
+        sys.exit("windlab: le format parquet nécessite pyarrow ou fastparquet (sinon --format csv ou json)")
+
+
+def _catalog(args):
+    from data.catalog import RunCatalog
+    return RunCatalog(args.directory, workers=args.workers)
+
+
+def _check_runs(args, catalog, run_ids):
+    """Erreur d'usage (et non KeyError) si un run demandé n'est pas dans le dossier."""
+    known = catalog.run_ids()
+    unknown = [r for r in run_ids or () if r not in known]
+    if unknown:
+        args.error(f"run(s) inconnu(s) dans {catalog.directory} : {', '.join(unknown)} "
+                   f"(disponibles : {', '.join(known) or 'aucun'})")
+
+
+def _positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"entier > 0 attendu : {text}")
+    return value
+
+
+def _progress(label):
+    def report(done, total):
+        print(f"\r{label} {done}/{total}", end="" if done < total else "\n", file=sys.stderr)
+    return report
+
+
+# ---------- Sous-commandes ----------
+def _ingest_task(paths, column):
+    from data.loader import load_labview_arrays
+    from data.preprocess import run_stats, sampling_rate_from_time
+
+    p1 = load_labview_arrays(paths["P1"], mmap_mode="r")
+    p2 = load_labview_arrays(paths["P2"], mmap_mode="r")
+    stats = run_stats(p1[column], p2[column])
+    stats["n_P1"] = len(p1[column])
+    stats["n_P2"] = len(p2[column])
+    stats["sampling_rate"] = sampling_rate_from_time(p1["t"])
+    return stats
+
+
+def _map_runs(catalog, fn, run_ids, workers, label, *args):
+    """Applique fn(paths, *args) à chaque run, en parallèle sur les cœurs."""
+    results = {}
+    report = _progress(label)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {r: pool.submit(fn, catalog.index[r], *args) for r in run_ids}
+        for i, (run_id, fut) in enumerate(futures.items(), 1):
+            results[run_id] = fut.result()
+            report(i, len(futures))
+    return results
+
+
+def cmd_ingest(args):
+    catalog = _catalog(args)
+    _check_runs(args, catalog, args.run)
+    run_ids = args.run or catalog.run_ids()
+    stats = _map_runs(catalog, _ingest_task, run_ids, args.workers, "ingest", args.column)
+    write_json(stats, args.out)
+
+
+def _filter_task(paths, column, fmin, fmax, out_dir, fmt):
+    import numpy as np
+    from data.catalog import parse_run_filename
+    from data.loader import load_labview_arrays
+    from data.preprocess import fft_filter, sampling_rate_from_time
+
+    run_id, _ = parse_run_filename(os.path.basename(paths["P1"]))
+    out_path = os.path.join(out_dir, f"run_{run_id}_filtered.{fmt}")
+
+    p1 = load_labview_arrays(paths["P1"], mmap_mode="r")
+    p2 = load_labview_arrays(paths["P2"], mmap_mode="r")
+    fs = sampling_rate_from_time(p1["t"])
+    n = min(len(p1[column]), len(p2[column]))
+
+    f1, _, _ = fft_filter(np.asarray(p1[column][:n]), fs, fmin, fmax, pad=True)
+    f2, _, _ = fft_filter(np.asarray(p2[column][:n]), fs, fmin, fmax, pad=True)
+    return write_table({"t": p1["t"][:n], "P1": f1, "P2": f2}, out_path, fmt)
+
+
+def cmd_filter(args):
+    check_format(args.format)
+    catalog = _catalog(args)
+    _check_runs(args, catalog, args.run)
+    run_ids = args.run or catalog.run_ids()
+    os.makedirs(args.out, exist_ok=True)
+    results = _map_runs(catalog, _filter_task, run_ids, args.workers, "filter",
+                        args.column, args.fmin, args.fmax, args.out, args.format)
+    write_json(results, os.path.join(args.out, "index.json"))
+
+
+def cmd_spectrum(args):
+    import numpy as np
+    from data.spectral import batch_spectra
+
+    check_format(args.format)
+    catalog = _catalog(args)
+    _check_runs(args, catalog, args.run)
+    spectra = batch_spectra(catalog, run_ids=args.run or None, column=args.column, nperseg=args.nperseg,
+                            workers=args.workers, progress=_progress("spectrum"))
+    os.makedirs(args.out, exist_ok=True)
+
+    summary = {}
+    for run_id, s in spectra.items():
+        write_table({
+            "f": s["f"], "psd_P1": s["psd_P1"], "psd_P2": s["psd_P2"],
+            "coherence": s["coherence"], "csd_re": s["csd"].real, "csd_im": s["csd"].imag,
+        }, os.path.join(args.out, f"run_{run_id}_spectrum.{args.format}"), args.format)
+        summary[run_id] = {
+            "sampling_rate": s["sampling_rate"],
+            "peak_f_P1": s["f"][np.argmax(s["psd_P1"][1:]) + 1],
+            "peak_f_P2": s["f"][np.argmax(s["psd_P2"][1:]) + 1],
+            "mean_coherence": np.nanmean(s["coherence"]),
+        }
+    write_json(summary, os.path.join(args.out, "index.json"))
+
+
+def cmd_correlate(args):
+    from data.correlation import batch_correlation
+
+    catalog = _catalog(args)
+    _check_runs(args, catalog, args.run)
+    result = batch_correlation(catalog, run_ids=args.run or None, column=args.column, max_lag=args.max_lag,
+                               fmin=args.fmin, fmax=args.fmax, nperseg=args.nperseg,
+                               workers=args.workers, progress=_progress("correlate"))
+    write_json(result, args.out)
+
+
+def cmd_montecarlo(args):
+    from data.loader import load_labview_arrays
+    from simulation.montecarlo import mc_summary
+
+    catalog = _catalog(args)
+    _check_runs(args, catalog, [args.run])
+    paths = catalog.index[args.run]
+    P1 = load_labview_arrays(paths["P1"], mmap_mode="r")[args.column]
+    P2 = load_labview_arrays(paths["P2"], mmap_mode="r")[args.column]
+
+    # mc_summary est séquentiel par défaut ; ici, comme les autres commandes, tous les cœurs
+    result = mc_summary(P1, P2, N=args.N, chunk_size=args.chunk_size, seed=args.seed,
+                        workers=args.workers or os.cpu_count(), progress=_progress("montecarlo"))
+    write_json(result, args.out)
+
+
+def cmd_sweep(args):
+    from simulation.montecarlo import spacing_sweep
+
+    if args.model == "jensen":
+        from physics.wake_jensen import JensenWake
+        model = JensenWake(args.D)
+    else:
+        from physics.wake_bastankhah import BastankhahWake
+        model = BastankhahWake(args.D)
+
+    results, bands = spacing_sweep(args.U0, args.sigma, distances=args.distances, model=model,
+                                   Ct=args.Ct, lateral_std=args.lateral_std, n_samples=args.samples,
+                                   replicates=args.replicates, method=args.method, seed=args.seed)
+    write_json({"mean": results, "bands": bands}, args.out)
+
+
+def cmd_optimize(args):
+    import numpy as np
+    from simulation.optimize import optimize_layout
+
+    U0, variance = args.U0, args.variance
+    if args.from_run:
+        from data.catalog import RunCatalog
+        from data.loader import load_labview_arrays
+
+        directory, run_id = args.from_run
+        catalog = RunCatalog(directory)
+        _check_runs(args, catalog, [run_id])
+        sig = load_labview_arrays(catalog.index[run_id]["P1"], mmap_mode="r")[args.column]
+        U0, variance = float(np.mean(sig)), float(np.var(sig))
+
+    score, pos = optimize_layout(args.turbines, U0, variance, terrain_size=args.terrain,
+                                 D=args.D, directions=args.directions, max_evals=args.evals,
+                                 seed=args.seed, progress=_progress("optimize"))
+    write_json({"score": score, "U0": U0, "variance": variance, "positions": pos}, args.out)
+
+
+def cmd_report(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    from reporting.pdf_generator import ReportSection, build_report, campaign_sections
+
+    catalog = _catalog(args)
+    _check_runs(args, catalog, args.run)
+    sections = campaign_sections(catalog, run_ids=args.run, column=args.column, progress=_progress("report"))
+    overview = ReportSection("Campagne", stats={"dossier": args.directory, "runs": len(sections)})
+    build_report(args.out, [overview, *sections], workers=args.workers)
+    print(args.out)
+
+
+# ---------- Parseur ----------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="windlab", description="WindLab – analyse de sillage sans interface")
+    parser.add_argument("--workers", type=int, default=None, help="processus parallèles (défaut : tous les cœurs)")
+    parser.add_argument("--profile", action="store_true",
+                        help="instrumente la session ; bilan sur stderr")
+    parser.add_argument("--profile-mode", action="append", choices=["cprofile", "memory"], default=[],
+                        help="capture en plus cProfile et/ou tracemalloc (répétable, implique --profile)")
+    parser.add_argument("--profile-out", help="écrit le bilan d'instrumentation en JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def campaign(name, help):
+        p = sub.add_parser(name, help=help)
+        p.add_argument("directory", help="dossier contenant les fichiers 'Run_XX n P1/P2.txt'")
+        p.add_argument("--column", default="lum", choices=["gen", "lum"])
+        p.set_defaults(error=p.error)
+        return p
+
+    p = campaign("ingest", "parse et met en cache tous les runs, statistiques en JSON")
+    p.add_argument("--run", nargs="*", help="runs à traiter (défaut : tous)")
+    p.add_argument("--out", default="-", help="fichier JSON (défaut : stdout)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = campaign("filter", "filtrage passe-bande FFT de P1 et P2")
+    p.add_argument("--fmin", type=float, default=None)
+    p.add_argument("--fmax", type=float, default=None)
+    p.add_argument("--run", nargs="*")
+    p.add_argument("--out", default="filtered")
+    p.add_argument("--format", choices=["csv", "json", "parquet"], default="csv",
+                   help="parquet : pyarrow ou fastparquet requis")
+    p.set_defaults(func=cmd_filter)
+
+    p = campaign("spectrum", "DSP de Welch, interspectre et cohérence P1/P2")
+    p.add_argument("--nperseg", type=int, default=1024)
+    p.add_argument("--run", nargs="*")
+    p.add_argument("--out", default="spectra")
+    p.add_argument("--format", choices=["csv", "json", "parquet"], default="csv",
+                   help="parquet : pyarrow ou fastparquet requis")
+    p.set_defaults(func=cmd_spectrum)
+
+    p = campaign("correlate", "retard P1 -> P2, corrélation au pic et cohérence de bande")
+    p.add_argument("--max-lag", type=float, default=None, help="retard maximal recherché (s)")
+    p.add_argument("--fmin", type=float, default=None)
+    p.add_argument("--fmax", type=float, default=None)
+    p.add_argument("--nperseg", type=int, default=1024)
+    p.add_argument("--run", nargs="*")
+    p.add_argument("--out", default="-")
+    p.set_defaults(func=cmd_correlate)
+
+    p = campaign("montecarlo", "Monte-Carlo par blocs sur un run")
+    p.add_argument("--run", required=True)
+    p.add_argument("-N", type=_positive_int, default=1_000_000)
+    p.add_argument("--chunk-size", type=_positive_int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--out", default="-")
+    p.set_defaults(func=cmd_montecarlo)
+
+    p = sub.add_parser("sweep", help="production moyenne de 2 turbines en fonction de l'espacement")
+    p.add_argument("--U0", type=float, default=8.0)
+    p.add_argument("--sigma", type=float, default=1.0)
+    p.add_argument("--model", choices=["bastankhah", "jensen"], default="bastankhah")
+    p.add_argument("--distances", type=float, nargs="+", default=list(range(2, 16)), help="en diamètres")
+    p.add_argument("--D", type=float, default=100)
+    p.add_argument("--Ct", type=float, default=0.7)
+    p.add_argument("--lateral-std", type=float, default=0.0, help="décalage latéral aléatoire (en D)")
+    p.add_argument("--samples", type=int, default=1024)
+    p.add_argument("--replicates", type=int, default=16)
+    p.add_argument("--method", choices=["sobol", "lhs", "random"], default="sobol")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--out", default="-")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("optimize", help="placement optimal de N turbines")
+    p.add_argument("--turbines", type=int, default=2)
+    p.add_argument("--U0", type=float, default=1.0)
+    p.add_argument("--variance", type=float, default=0.0)
+    p.add_argument("--from-run", nargs=2, metavar=("DOSSIER", "RUN"), help="U0 et variance tirés de P1 d'un run")
+    p.add_argument("--column", default="lum", choices=["gen", "lum"])
+    p.add_argument("--directions", type=float, nargs="+", default=[270.0])
+    p.add_argument("--terrain", type=float, default=2000)
+    p.add_argument("--D", type=float, default=100)
+    p.add_argument("--evals", type=int, default=5000)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--out", default="-")
+    p.set_defaults(func=cmd_optimize, error=p.error)
+
+    p = campaign("report", "rapport PDF de campagne")
+    p.add_argument("--run", nargs="*")
+    p.add_argument("--out", default="windlab_report.pdf")
+    p.set_defaults(func=cmd_report)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    profiling = None
+    if args.profile or args.profile_mode or args.profile_out:
+        from utils import profiling
+        modes = args.profile_mode
+        profiling.enable(profile="cprofile" in modes, memory="memory" in modes)
+
+    if profiling is None:
+        args.func(args)
+    else:
+        # Temps total de la sous-commande : le travail fait dans les processus
+        # du pool n'est pas vu par l'instrumentation du processus principal
+        with profiling.timer(f"cli.{args.command}"):
+            args.func(args)
+
+    if profiling is not None:
+        print(profiling.format_summary(), file=sys.stderr)
+        if args.profile_out:
+            profiling.dump_json(args.profile_out)
+
+
+if __name__ == "__main__":
+    main()
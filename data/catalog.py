@@ -0,0 +1,232 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from data.loader import CACHE_DIRNAME, load_labview_arrays, load_labview_run
+from utils.cache import DiskCache, hash_key
+from utils.tasks import run_tasks
+
+TURBINES = ("P1", "P2")
+
+
+def parse_run_filename(filename):
+    """
+    Découpe un nom de fichier de mesure : "Run_34 1 P1.txt" -> ("1", "P1").
+
+    Renvoie None si le nom ne suit pas le format attendu.
+    """
+    if not filename.endswith(".txt"):
+        return None
+
+    parts = filename[:-len(".txt")].split()
+    if len(parts) < 3:
+        return None
+
+    return parts[1], parts[2]
+
+
+def load_run(paths, mmap=True, dtype=np.float64):
+    """Charge les fichiers d'un run : {turbine: chemin} -> {turbine: RunData}."""
+    return {turbine: load_labview_run(path, mmap=mmap, dtype=dtype) for turbine, path in paths.items()}
+
+
+MAX_LOADED = 64
+
+
+def default_max_loaded():
+    """
+    Taille par défaut du LRU de runs : MAX_LOADED, moins si la limite de
+    fichiers ouverts est basse. Chaque run chargé en mmap garde un
+    descripteur par turbine ; le LRU n'en utilise pas plus d'un quart.
+    """
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return MAX_LOADED  # Pas de module resource (Windows)
+    if soft == resource.RLIM_INFINITY:
+        return MAX_LOADED
+    return max(1, min(MAX_LOADED, soft // (4 * len(TURBINES))))
+
+
+class RunCatalog:
+    """
+    Index paresseux des runs d'un dossier de campagne.
+
+    Le scan ne lit que les noms de fichiers ({run_id: {"P1": chemin, "P2": chemin}}) ;
+    les fichiers ne sont parsés qu'au moment où un run est demandé, et seuls
+    les `max_loaded` derniers runs utilisés restent en mémoire (LRU).
+    Un run chargé est un RunData projeté sur le cache .npy (mmap=True) : il
+    ne coûte presque rien en RAM, mais garde un fichier ouvert par turbine ;
+    par défaut le LRU est dimensionné sur la limite de descripteurs
+    (`default_max_loaded`).
+    Avec mmap=False les colonnes sont copiées en mémoire au `dtype` demandé.
+    Le LRU est protégé par un verrou : le catalogue peut être utilisé depuis
+    un thread de fond.
+    """
+
+    def __init__(self, directory, max_loaded=None, workers=None, mmap=True, dtype=np.float64):
+        self.directory = directory
+        self.max_loaded = default_max_loaded() if max_loaded is None else max_loaded
+        self.workers = workers
+        self.mmap = mmap
+        self.dtype = dtype
+        self.index = {}
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+        self.scan()
+
+    # ---------- Index ----------
+    def scan(self):
+        self.index = {}
+        self.clear()
+
+        for f in sorted(os.listdir(self.directory)):
+            parsed = parse_run_filename(f)
+            if parsed is None:
+                continue
+            run_id, turbine = parsed
+            self.index.setdefault(run_id, {})[turbine] = os.path.join(self.directory, f)
+
+        return self.index
+
+    def run_ids(self, complete=True):
+        """Identifiants des runs (par défaut : seulement ceux qui ont P1 et P2)."""
+        if not complete:
+            return list(self.index)
+        return [r for r, paths in self.index.items() if all(t in paths for t in TURBINES)]
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, run_id):
+        return run_id in self.index
+
+    # ---------- Chargement ----------
+    def _remember(self, run_id, run):
+        with self._lock:
+            self._loaded[run_id] = run
+            self._loaded.move_to_end(run_id)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+
+    def _cached(self, run_id):
+        with self._lock:
+            run = self._loaded.get(run_id)
+            if run is not None:
+                self._loaded.move_to_end(run_id)
+            return run
+
+    def get(self, run_id):
+        """Renvoie {turbine: RunData} pour un run, en le parsant si besoin."""
+        run = self._cached(run_id)
+        if run is not None:
+            return run
+
+        run = load_run(self.index[run_id], self.mmap, self.dtype)
+        self._remember(run_id, run)
+        return run
+
+    def iter_runs(self, run_ids=None, progress=None):
+        """
+        Parse plusieurs runs en parallèle (pool de processus) et les renvoie
+        au fil de l'eau : (run_id, {turbine: RunData}).
+
+        L'ordre de sortie est celui de fin de parsing. `progress(done, total)`
+        est appelé après chaque run. Les runs projetés reviennent des workers
+        sous forme de chemin de cache (voir RunData.__reduce__), sans copie.
+        """
+        if run_ids is None:
+            run_ids = self.run_ids()
+        total = len(run_ids)
+        done = 0
+
+        pending = []
+        for run_id in run_ids:
+            run = self._cached(run_id)
+            if run is None:
+                pending.append(run_id)
+                continue
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            yield run_id, run
+
+        if not pending:
+            return
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = {}
+        try:
+            futures = {pool.submit(load_run, self.index[r], self.mmap, self.dtype): r for r in pending}
+            for fut in as_completed(futures):
+                run_id = futures[fut]
+                run = fut.result()
+                self._remember(run_id, run)
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield run_id, run
+        finally:
+            # Consommateur arrêté (annulation, erreur) : les runs en attente
+            # ne sont pas parsés. Annulation explicite : l'exécuteur peut être
+            # collecté avant que son thread de gestion ne traite cancel_futures
+            for fut in futures:
+                fut.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def prefetch(self, run_ids=None, progress=None):
+        """Parse les runs en parallèle pour remplir le cache disque (.npy)."""
+        for _ in self.iter_runs(run_ids, progress=progress):
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._loaded.clear()
+
+
+# ---------- Analyses par run ----------
+def _batch_task(args):
+    run_id, paths, fn, column, params, cache_dir = args
+    p1 = load_labview_arrays(paths["P1"], mmap_mode="r")
+    p2 = load_labview_arrays(paths["P2"], mmap_mode="r")
+
+    cache = DiskCache(cache_dir) if cache_dir else None
+    key = hash_key(fn.__name__, p1["t"], p1[column], p2[column], params)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return run_id, cached
+
+    result = fn(p1["t"], p1[column], p2[column], **params)
+    if cache is not None:
+        cache.set(key, result)
+    return run_id, result
+
+
+def batch_runs(catalog, fn, name, params, run_ids=None, column="lum", workers=None,
+               cache_dir=None, use_cache=True, progress=None):
+    """
+    fn(t, P1, P2, **params) pour chaque run d'un RunCatalog, en parallèle
+    (un processus par run ; `fn` doit être une fonction de module).
+
+    Les résultats (dicts d'arrays) sont stockés dans un cache disque adressé
+    par contenu (empreinte des signaux + paramètres), par défaut dans
+    <dossier>/.windlab_cache/<name> : relancer avec les mêmes données et les
+    mêmes paramètres ne recalcule rien.
+
+    Renvoie {run_id: résultat} dans l'ordre de `run_ids`.
+    """
+    if run_ids is None:
+        run_ids = catalog.run_ids()
+    if not use_cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = os.path.join(catalog.directory, CACHE_DIRNAME, name)
+
+    tasks = [(r, catalog.index[r], fn, column, params, cache_dir) for r in run_ids]
+    results = run_tasks(_batch_task, tasks, workers, progress)
+    return {r: results[r] for r in run_ids}
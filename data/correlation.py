@@ -0,0 +1,112 @@
+import numpy as np
+from numpy.fft import rfft, irfft
+
+from data.catalog import batch_runs
+from data.preprocess import band_slice, sampling_rate_from_time
+
+
+def _centered_rfft(x, n, nfft):
+    """rfft de x[:n] - mean, le recentrage étant écrit directement dans le tampon FFT."""
+    buf = np.zeros(nfft)
+    np.subtract(x[:n], np.mean(x[:n]), out=buf[:n])
+    energy = np.dot(buf[:n], buf[:n])
+    return rfft(buf), energy
+
+
+def cross_correlation(x, y, max_lag=None):
+    """
+    Corrélation croisée normalisée de x et y sur leur longueur commune n :
+
+        c[k] = sum_i (x_i - mx)(y_{i+k} - my) / (n sx sy),  |k| <= max_lag
+
+    Calculée par FFT (O(n log n)), avec un remplissage de zéros suffisant
+    pour qu'il n'y ait pas de repliement circulaire jusqu'à max_lag. Les
+    signaux (arrays ou memmap) ne sont lus que par tranches [:n] : seul le
+    tampon FFT de chaque signal est alloué.
+
+    Un décalage k > 0 signifie que y est en retard sur x.
+    Renvoie (lags, c) avec lags = -max_lag..max_lag (en échantillons).
+    """
+    from scipy.fft import next_fast_len
+
+    n = min(len(x), len(y))
+    max_lag = n - 1 if max_lag is None else min(int(max_lag), n - 1)
+    nfft = next_fast_len(n + max_lag, real=True)
+
+    X, ex = _centered_rfft(x, n, nfft)
+    Y, ey = _centered_rfft(y, n, nfft)
+    Y *= np.conj(X)
+    del X
+    full = irfft(Y, nfft)
+
+    c = np.concatenate([full[nfft - max_lag:], full[:max_lag + 1]])
+    norm = np.sqrt(ex * ey)
+    c = c / norm if norm > 0 else np.zeros_like(c)
+    return np.arange(-max_lag, max_lag + 1), c
+
+
+def peak_lag(lags, c):
+    """
+    Décalage du maximum de corrélation, affiné par interpolation parabolique
+    sur les trois points autour du pic. Renvoie (lag, peak).
+    """
+    i = int(np.argmax(c))
+    if 0 < i < len(c) - 1:
+        a, b, d = c[i - 1], c[i], c[i + 1]
+        denom = a - 2*b + d
+        if denom < 0:
+            shift = 0.5 * (a - d) / denom
+            return lags[i] + shift, b - 0.25 * (a - d) * shift
+    return float(lags[i]), c[i]
+
+
+def run_correlation(t, sig1, sig2, max_lag=None, fmin=None, fmax=None, nperseg=1024,
+                    sampling_rate=None, full=False):
+    """
+    Propagation P1 -> P2 d'un run :
+      - lag       : retard de P2 sur P1 au pic de corrélation croisée (s)
+      - peak      : corrélation normalisée au pic
+      - coherence : cohérence moyenne dans la bande [fmin, fmax] (Welch)
+
+    `max_lag` (s) borne la recherche du retard (défaut : toute la longueur
+    commune). Avec full=True, la courbe de corrélation est aussi renvoyée
+    ("lags" en s, "correlation").
+    """
+    import scipy.signal as sg
+
+    fs = sampling_rate_from_time(t) if sampling_rate is None else sampling_rate
+    n = min(len(sig1), len(sig2))
+    lag_samples = None if max_lag is None else int(round(max_lag * fs))
+
+    lags, c = cross_correlation(sig1, sig2, lag_samples)
+    lag, peak = peak_lag(lags, c)
+
+    f, coh = sg.coherence(sig1[:n], sig2[:n], fs=fs, nperseg=min(nperseg, n))
+    band = band_slice(f, fmin, fmax)
+
+    result = {
+        "lag": np.float64(lag / fs),
+        "lag_samples": np.float64(lag),
+        "peak": np.float64(peak),
+        "coherence": np.float64(np.nanmean(coh[band])) if len(coh[band]) else np.float64(np.nan),
+        "sampling_rate": np.float64(fs),
+    }
+    if full:
+        result["lags"] = lags / fs
+        result["correlation"] = c
+    return result
+
+
+def batch_correlation(catalog, run_ids=None, column="lum", max_lag=None, fmin=None, fmax=None,
+                      nperseg=1024, sampling_rate=None, workers=None, cache_dir=None,
+                      use_cache=True, progress=None):
+    """
+    Retard, corrélation au pic et cohérence de bande P1/P2 pour tous les runs
+    d'un RunCatalog, en parallèle (un processus par run), avec le même cache
+    disque adressé par contenu que `batch_spectra`.
+
+    Renvoie {run_id: dict de run_correlation}.
+    """
+    params = dict(max_lag=max_lag, fmin=fmin, fmax=fmax, nperseg=nperseg, sampling_rate=sampling_rate)
+    return batch_runs(catalog, run_correlation, "correlation", params, run_ids, column, workers,
+                      cache_dir, use_cache, progress)
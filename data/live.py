@@ -0,0 +1,277 @@
+import os
+
+import numpy as np
+
+from data.loader import read_rows, read_table_header
+from data.preprocess import sampling_rate_from_time
+from physics.turbulence import turbulence_intensity
+from utils.math_tools import RunningStats
+
+TURBINES = ("P1", "P2")
+
+
+class FileTail:
+    """
+    Suivi d'un fichier LabVIEW en cours d'écriture.
+
+    `poll()` ne lit que les octets ajoutés depuis l'appel précédent (à partir
+    du dernier offset), ne parse que les lignes complètes et garde la ligne
+    en cours d'écriture pour le prochain appel. Au plus `max_bytes` sont lus
+    par appel : rattraper un long fichier se fait en plusieurs appels de
+    durée bornée. Si le fichier rétrécit (réécrit par LabVIEW), le suivi
+    repart du début et `resets` est incrémenté.
+    """
+
+    def __init__(self, filepath, max_bytes=2**20):
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.resets = 0  # Nombre de redémarrages sur un fichier réécrit
+        self.reset()
+
+    def reset(self):
+        self.offset = None  # Position du prochain octet à parser
+        self.behind = False  # Lecture limitée par max_bytes au dernier appel
+        self.columns = None
+        self.n_fields = None
+
+    def _open_table(self):
+        try:
+            offset, columns, n_fields = read_table_header(self.filepath)
+        except (OSError, ValueError):
+            return False  # En-tête pas encore écrit
+        self.offset, self.columns, self.n_fields = offset, columns, n_fields
+        return True
+
+    def poll(self):
+        """Nouvelles lignes : dict {nom: array} (vide s'il n'y en a pas)."""
+        try:
+            size = os.path.getsize(self.filepath)
+        except OSError:
+            return {}
+
+        if self.offset is not None and size < self.offset:
+            self.reset()
+            self.resets += 1
+        if self.offset is None and not self._open_table():
+            return {}
+        if size <= self.offset:
+            self.behind = False
+            return {}
+
+        self.behind = size - self.offset > self.max_bytes
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, self.max_bytes))
+
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return {}  # Ligne incomplète : on attend la suite
+        self.offset += end
+        return read_rows(data[:end], self.columns, self.n_fields)
+
+
+class RingBuffer:
+    """Tampon circulaire numpy de capacité fixe (les plus anciennes valeurs sont écrasées)."""
+
+    def __init__(self, capacity, shape=(), dtype=np.float64):
+        self.data = np.zeros((capacity, *shape), dtype=dtype)
+        self.capacity = capacity
+        self.count = 0  # Nombre total de valeurs reçues
+        self.head = 0   # Position de la prochaine écriture
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        n = len(values)
+        if n >= self.capacity:
+            self.data[:] = values[n - self.capacity:]
+            self.head = 0
+        else:
+            first = min(n, self.capacity - self.head)
+            self.data[self.head:self.head + first] = values[:first]
+            self.data[:n - first] = values[first:]
+            self.head = (self.head + n) % self.capacity
+        self.count += n
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def values(self):
+        """Contenu dans l'ordre chronologique (copie de taille <= capacity)."""
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate([self.data[self.head:], self.data[:self.head]])
+
+
+class LiveSpectrogram:
+    """
+    Spectrogramme incrémental : chaque nouveau segment complet de `nperseg`
+    échantillons (pas nperseg - noverlap) ajoute une colonne dans un tampon
+    circulaire de `n_columns` colonnes. Le coût d'une mise à jour ne dépend
+    que du nombre de nouveaux échantillons.
+
+    Même normalisation que `compute_spectrogram` (scipy.signal.spectrogram,
+    mode magnitude, fenêtre de Tukey 0.25, moyenne retirée par segment).
+    """
+
+    def __init__(self, sampling_rate, nperseg=256, noverlap=128, n_columns=240):
+        import scipy.signal as sg
+
+        self.fs = sampling_rate
+        self.nperseg = nperseg
+        self.step = nperseg - noverlap
+        self.window = sg.get_window(("tukey", 0.25), nperseg)
+        self.scale = np.sqrt(1.0 / (sampling_rate * np.sum(self.window**2)))
+        self.f = np.fft.rfftfreq(nperseg, 1 / sampling_rate)
+        self.columns = RingBuffer(n_columns, shape=(len(self.f),))
+        self.tail = np.empty(0)  # Échantillons pas encore couverts par un segment
+
+    def update(self, samples):
+        """Ajoute des échantillons ; renvoie le nombre de nouvelles colonnes."""
+        buf = np.concatenate([self.tail, np.asarray(samples, dtype=float)])
+        n_seg = 0 if len(buf) < self.nperseg else (len(buf) - self.nperseg) // self.step + 1
+        if n_seg:
+            # (n_seg, nperseg) sans copie, puis une seule FFT pour tous les segments
+            segs = np.lib.stride_tricks.sliding_window_view(buf, self.nperseg)[::self.step][:n_seg]
+            segs = (segs - segs.mean(axis=1, keepdims=True)) * self.window
+            self.columns.extend(np.abs(np.fft.rfft(segs, axis=1)) * self.scale)
+        self.tail = buf[n_seg * self.step:]
+        return n_seg
+
+    def spectrogram(self):
+        """
+        (f, t, Sxx) de forme constante (len(f), n_columns) : t en secondes
+        relatives à la colonne la plus récente (<= 0) ; les colonnes pas
+        encore calculées valent 0.
+        """
+        n = self.columns.capacity
+        Sxx = np.zeros((n, len(self.f)))
+        values = self.columns.values()
+        if len(values):
+            Sxx[n - len(values):] = values
+        t = (np.arange(n) - (n - 1)) * self.step / self.fs
+        return self.f, t, Sxx.T
+
+
+class LiveRun:
+    """
+    Suivi en direct d'un run P1/P2 ({turbine: chemin}).
+
+    À chaque `update()` :
+      - seules les nouvelles lignes des deux fichiers sont parsées (FileTail)
+      - moyennes / variances courantes (Welford) et TI = std(P1 - P2) / mean(P1)
+        sur les échantillons appariés, comme `run_stats`
+      - les `window` derniers échantillons de chaque turbine (tampons
+        circulaires, pour l'affichage) et le spectrogramme de `column` P2
+
+    Si un fichier n'avance pas, au plus `window` échantillons de l'autre
+    restent en attente d'appariement (les plus anciens sont abandonnés, et
+    leurs partenaires sautés à leur arrivée). Si un fichier est réécrit,
+    tout repart de zéro : statistiques, tampons et lecture des deux fichiers.
+    """
+
+    def __init__(self, paths, column="lum", window=30_000, sampling_rate=None,
+                 nperseg=256, noverlap=128, n_columns=240, max_bytes=2**20):
+        self.column = column
+        self.window = window
+        self.tails = {turbine: FileTail(paths[turbine], max_bytes) for turbine in TURBINES}
+        self._first_t = np.empty(0)
+        self.sampling_rate = sampling_rate
+        self._spectro_params = dict(nperseg=nperseg, noverlap=noverlap, n_columns=n_columns)
+        self._clear()
+
+    def _clear(self):
+        """Statistiques et tampons vides (le taux d'échantillonnage est gardé)."""
+        self.recent = {turbine: RingBuffer(self.window) for turbine in TURBINES}
+        self.stats = {turbine: RunningStats() for turbine in TURBINES}
+        self.diff = RunningStats()
+        self._unpaired = {turbine: np.empty(0) for turbine in TURBINES}
+        self._skip = {turbine: 0 for turbine in TURBINES}  # Partenaires abandonnés
+        self.spectrogram = None
+        if self.sampling_rate is not None:
+            self.spectrogram = LiveSpectrogram(self.sampling_rate, **self._spectro_params)
+
+    def _restart(self, turbine):
+        """Le fichier de `turbine` a été réécrit : relit aussi l'autre depuis le début."""
+        self._clear()
+        for other, tail in self.tails.items():
+            if other != turbine:
+                tail.reset()
+
+    def _detect_rate(self, t):
+        self._first_t = np.concatenate([self._first_t, t])[:1000]
+        if len(self._first_t) >= 2:
+            try:
+                self.sampling_rate = sampling_rate_from_time(self._first_t)
+            except ValueError:
+                return
+            self.spectrogram = LiveSpectrogram(self.sampling_rate, **self._spectro_params)
+
+    def update(self):
+        """Lit les nouvelles lignes ; renvoie le nombre d'échantillons ajoutés."""
+        added = 0
+        for turbine in TURBINES:
+            tail = self.tails[turbine]
+            resets = tail.resets
+            block = tail.poll()
+            if tail.resets != resets:
+                self._restart(turbine)
+                added = 0
+            y = block.get(self.column)
+            if y is None or not len(y):
+                continue
+            added += len(y)
+
+            self.stats[turbine].update(y)
+            self.recent[turbine].extend(y)
+            skip = min(self._skip[turbine], len(y))
+            self._skip[turbine] -= skip
+            self._unpaired[turbine] = np.concatenate([self._unpaired[turbine], y[skip:]])
+
+            if turbine == "P2":
+                if self.spectrogram is None:
+                    self._detect_rate(block["t"])
+                if self.spectrogram is not None:
+                    self.spectrogram.update(y)
+
+        # Différence P1 - P2 sur les échantillons reçus des deux côtés
+        n = min(len(v) for v in self._unpaired.values())
+        if n:
+            p1, p2 = self._unpaired["P1"], self._unpaired["P2"]
+            self.diff.update(p1[:n] - p2[:n])
+            self._unpaired = {"P1": p1[n:], "P2": p2[n:]}
+
+        # Un seul côté peut rester en attente : borné à `window` échantillons
+        for turbine, other in (("P1", "P2"), ("P2", "P1")):
+            excess = len(self._unpaired[turbine]) - self.window
+            if excess > 0:
+                self._unpaired[turbine] = self._unpaired[turbine][excess:]
+                self._skip[other] += excess
+        return added
+
+    @property
+    def behind(self):
+        """True tant qu'un des fichiers n'a pas été lu jusqu'au bout (rattrapage)."""
+        return any(tail.behind for tail in self.tails.values())
+
+    def run_stats(self):
+        """Mêmes clés que data.preprocess.run_stats, sur tout ce qui a été lu."""
+        s1, s2 = self.stats["P1"], self.stats["P2"]
+        return {
+            "mean": s1.mean,
+            "mean_P2": s2.mean,
+            "variance": s1.variance(),
+            "TI": self.diff.std() / s1.mean if s1.count else np.nan,
+            "n_P1": s1.count,
+            "n_P2": s2.count,
+        }
+
+    def signals(self):
+        """Derniers échantillons (P1, P2) pour l'affichage."""
+        return self.recent["P1"].values(), self.recent["P2"].values()
+
+    def window_ti(self):
+        """TI sur la fenêtre affichée seulement (longueur commune)."""
+        p1, p2 = self.signals()
+        if not len(p1) or not len(p2):
+            return np.nan
+        return turbulence_intensity(p1, p2)
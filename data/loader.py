@@ -1,8 +1,325 @@
 import pandas as pd
 import numpy as np
 import io
+import mmap
+import os
+import re
 
-def load_labview_txt(filepath):
+from utils.cache import temp_path
+from utils.math_tools import RunningStats
+from utils.profiling import instrument
+
+HEADER_MARK = b"***End_of_Header***"
+
+# Noms LabVIEW (en minuscules) -> noms normalisés
+COLUMN_NAMES = {"x_value": "t", "generateur": "gen", "lumiere": "lum"}
+NUMERIC_COLUMNS = ("t", "gen", "lum")
+
+CACHE_DIRNAME = ".windlab_cache"
+
+
+# ---------- Header ----------
+def find_data_offset(filepath):
+    """
+    Renvoie l'offset (en octets) de la ligne qui suit le DERNIER
+    ***End_of_Header*** du fichier (0 s'il n'y en a pas).
+
+    Le fichier est projeté en mémoire (mmap) et la recherche part de la fin :
+    rien n'est chargé en RAM, quelle que soit la taille de la capture.
+    """
+    with open(filepath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.rfind(HEADER_MARK)
+            if pos < 0:
+                return 0
+            eol = mm.find(b"\n", pos)
+            return size if eol < 0 else eol + 1
+
+
+def read_table_header(filepath):
+    """
+    Lit la ligne de titres de la table (X_Value, Generateur, Lumiere, ...).
+
+    Renvoie (offset, columns) :
+      - offset  : position en octets de la première ligne de données
+      - columns : dict {nom normalisé: indice de colonne} pour t, gen, lum
+    """
+    with open(filepath, "rb") as f:
+        f.seek(find_data_offset(filepath))
+        line = f.readline()
+        while line and not line.strip():
+            line = f.readline()
+        offset = f.tell()
+
+    names = line.decode("utf-8", errors="ignore").rstrip("\r\n").split("\t")
+    columns = {}
+    for i, name in enumerate(names):
+        key = COLUMN_NAMES.get(name.strip().lower())
+        if key is not None and key not in columns:
+            columns[key] = i
+
+    if "t" not in columns:
+        raise ValueError(f"Colonne X_Value introuvable dans {filepath}")
+
+    return offset, columns, len(names)
+
+
+# ---------- Parsing ----------
+def _normalize_table(df, columns):
+    rename = {i: name for name, i in columns.items()}
+    df = df.rename(columns=rename)[[c for c in NUMERIC_COLUMNS if c in columns]]
+    for col in df.columns:
+        if df[col].dtype != np.float64:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def _csv_reader(f, n_fields, chunksize=None):
+    return pd.read_csv(
+        f,
+        sep="\t",
+        decimal=",",
+        header=None,
+        names=range(n_fields),
+        engine="c",
+        chunksize=chunksize,
+    )
+
+
+def read_rows(data, columns, n_fields):
+    """
+    Parse des lignes de données déjà lues (bytes, lignes complètes) :
+    dict {nom: array float64}. Les lignes sans temps valide (ex. un nouvel
+    en-tête de segment) sont écartées.
+    """
+    if not data.strip():
+        return {col: np.empty(0) for col in NUMERIC_COLUMNS if col in columns}
+
+    df = _normalize_table(_csv_reader(io.BytesIO(data), n_fields), columns)
+    arrays = {col: df[col].to_numpy(dtype=np.float64) for col in df.columns}
+    valid = ~np.isnan(arrays["t"])
+    if not valid.all():
+        arrays = {col: a[valid] for col, a in arrays.items()}
+    return arrays
+
+
+def read_table(filepath, offset, columns, n_fields, chunksize=None):
+    """
+    Parse la zone de données avec le moteur C de pandas (décimale = virgule).
+
+    Seules les colonnes numériques sont conservées ; Comment est abandonnée.
+    Avec `chunksize`, renvoie un itérateur de DataFrames.
+    """
+    f = open(filepath, "rb")
+    f.seek(offset)
+    reader = _csv_reader(f, n_fields, chunksize)
+
+    if chunksize is None:
+        with f:
+            return _normalize_table(reader, columns)
+
+    def chunks():
+        with f, reader:
+            for chunk in reader:
+                yield _normalize_table(chunk, columns)
+
+    return chunks()
+
+
+# ---------- Cache colonne ----------
+def _cache_key(filepath):
+    st = os.stat(filepath)
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def _cache_pattern(filepath):
+    base = re.escape(os.path.basename(filepath))
+    return re.compile(rf"^{base}\.(\d+-\d+)\.([a-z-]+)\.npy$")
+
+
+def cache_path(filepath):
+    """
+    Chemin du cache colonne associé à `filepath`, ou None s'il n'est pas à jour.
+
+    Le cache vit dans un dossier .windlab_cache/ à côté du fichier ; son nom
+    encode la taille et la date de modification du fichier source ainsi que
+    l'ordre des colonnes (ex. "Run_34 1 P1.txt.123456-1700000000.t-gen-lum.npy").
+    """
+    directory = os.path.join(os.path.dirname(os.path.abspath(filepath)), CACHE_DIRNAME)
+    if not os.path.isdir(directory):
+        return None
+
+    key = _cache_key(filepath)
+    pattern = _cache_pattern(filepath)
+    for name in os.listdir(directory):
+        m = pattern.match(name)
+        if m and m.group(1) == key:
+            return os.path.join(directory, name)
+    return None
+
+
+def read_cache(path, mmap_mode=None):
+    """
+    Lit un cache colonne : dict {nom: array 1D contigu}.
+
+    Avec mmap_mode="r" les colonnes sont des vues sur le fichier (zéro copie).
+    """
+    names = os.path.basename(path).rsplit(".", 2)[1].split("-")
+    arr = np.load(path, mmap_mode=mmap_mode)
+    return {name: arr[i] for i, name in enumerate(names)}
+
+
+def write_cache(filepath, arrays):
+    """
+    Écrit le cache colonne de `filepath` (tableau (k, n) float64) et supprime
+    les versions périmées. Silencieux si le dossier n'est pas inscriptible.
+    """
+    directory = os.path.join(os.path.dirname(os.path.abspath(filepath)), CACHE_DIRNAME)
+    names = [c for c in NUMERIC_COLUMNS if c in arrays]
+    name = f"{os.path.basename(filepath)}.{_cache_key(filepath)}.{'-'.join(names)}.npy"
+    path = os.path.join(directory, name)
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        pattern = _cache_pattern(filepath)
+        for old in os.listdir(directory):
+            if pattern.match(old) and old != name:
+                os.remove(os.path.join(directory, old))
+
+        tmp = temp_path(path)
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, np.vstack([arrays[c] for c in names]))
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    except OSError:
+        return None
+    return path
+
+
+# ---------- API ----------
+@instrument()
+def load_labview_arrays(filepath, use_cache=True, mmap_mode=None):
+    """
+    Charge les colonnes t, gen, lum d'un fichier LabVIEW sous forme de
+    dict {nom: array float64}, en passant par le cache colonne si possible.
+    """
+    if use_cache:
+        path = cache_path(filepath)
+        if path is not None:
+            try:
+                return read_cache(path, mmap_mode=mmap_mode)
+            except (OSError, ValueError):
+                pass
+
+    offset, columns, n_fields = read_table_header(filepath)
+    df = read_table(filepath, offset, columns, n_fields)
+    arrays = {col: df[col].to_numpy(dtype=np.float64) for col in df.columns}
+
+    if use_cache:
+        path = write_cache(filepath, arrays)
+        if path is not None and mmap_mode is not None:
+            return read_cache(path, mmap_mode=mmap_mode)
+
+    return arrays
+
+
+class RunData:
+    """
+    Mesure d'une éolienne sous forme compacte : colonnes t, gen, lum en
+    arrays numpy 1D contigus, sans DataFrame ni colonne Comment.
+
+    Les colonnes sont soit des vues np.memmap sur le cache .npy (zéro copie,
+    les pages restent dans le cache du système), soit des arrays en mémoire
+    (float32 pour gen/lum si demandé ; t reste en float64).
+    `run["lum"]` et `run.lum` renvoient la même vue, sans copie.
+    """
+
+    __slots__ = ("t", "gen", "lum", "source")
+
+    def __init__(self, t, gen, lum, source=None):
+        self.t = t
+        self.gen = gen
+        self.lum = lum
+        self.source = source  # Chemin du cache si les colonnes sont projetées
+
+    @classmethod
+    def from_arrays(cls, arrays, dtype=np.float64, source=None):
+        def column(name, dt):
+            a = arrays.get(name)
+            if a is None:
+                return np.empty(0, dtype=dt)
+            if isinstance(a, np.memmap) and a.dtype == dt:
+                return a
+            return np.ascontiguousarray(a, dtype=dt)
+
+        return cls(column("t", np.float64), column("gen", dtype), column("lum", dtype), source)
+
+    @classmethod
+    def from_cache(cls, path):
+        return cls.from_arrays(read_cache(path, mmap_mode="r"), source=path)
+
+    def __reduce__(self):
+        # Entre processus, un run projeté voyage comme un chemin : le
+        # destinataire rouvre la projection au lieu de recevoir les données
+        if self.source is not None:
+            return RunData.from_cache, (self.source,)
+        return RunData, (self.t, self.gen, self.lum)
+
+    def __getitem__(self, name):
+        if name not in NUMERIC_COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __len__(self):
+        return len(self.t)
+
+    @property
+    def columns(self):
+        return NUMERIC_COLUMNS
+
+    @property
+    def nbytes(self):
+        """Octets en mémoire (0 pour les colonnes projetées depuis le disque)."""
+        return sum(0 if isinstance(a, np.memmap) else a.nbytes for a in (self.t, self.gen, self.lum))
+
+    def to_frame(self):
+        return pd.DataFrame({name: getattr(self, name) for name in NUMERIC_COLUMNS})
+
+
+def load_labview_run(filepath, use_cache=True, mmap=True, dtype=np.float64):
+    """
+    Charge un fichier LabVIEW en RunData.
+
+    Avec mmap=True (et un cache .npy disponible) les colonnes sont projetées
+    depuis le cache ; sinon elles sont chargées en mémoire au `dtype` demandé
+    (np.float32 divise par deux la place de gen/lum).
+    """
+    arrays = None
+    if mmap and use_cache and np.dtype(dtype) == np.float64:
+        path = cache_path(filepath)
+        if path is None:
+            arrays = load_labview_arrays(filepath)
+            path = cache_path(filepath)  # None si le cache n'a pas pu être écrit
+        if path is not None:
+            try:
+                return RunData.from_cache(path)
+            except (OSError, ValueError):
+                pass
+
+    if arrays is None:
+        arrays = load_labview_arrays(filepath, use_cache=use_cache)
+    return RunData.from_arrays(arrays, dtype=dtype)
+
+
+@instrument()
+def load_labview_txt(filepath, use_cache=True):
     """
     Charge un fichier LabVIEW Measurement (.lvm / .txt) au format :
 
@@ -16,55 +333,25 @@ def load_labview_txt(filepath):
     ...
 
     On :
-      - saute tous les headers
-      - lit la table après le dernier ***End_of_Header***
-      - gère les virgules comme séparateur décimal
-      - renomme les colonnes en t, gen, lum, comment
+      - repère le dernier ***End_of_Header*** par offset (sans lire le fichier en RAM)
+      - parse la table avec le moteur C de pandas (virgule = séparateur décimal)
+      - renomme les colonnes en t, gen, lum (la colonne Comment est ignorée)
+      - écrit/relit un cache colonne .npy à côté du fichier (clé : taille + mtime)
     """
+    arrays = load_labview_arrays(filepath, use_cache=use_cache)
+    return pd.DataFrame(arrays)
 
-    # 1) Lire tout le fichier en mémoire
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        lines = f.readlines()
-
-    # 2) Trouver l'indice de la DERNIÈRE ligne contenant ***End_of_Header***
-    start_idx = 0
-    for i, line in enumerate(lines):
-        if "***End_of_Header***" in line:
-            start_idx = i + 1  # les données commencent après
-
-    # 3) Construire une chaîne avec uniquement les lignes de données
-    data_str = "".join(lines[start_idx:])
-
-    # 4) Parser avec pandas : séparateur = tab, décimale = virgule
-    df = pd.read_csv(
-        io.StringIO(data_str),
-        sep="\t",
-        decimal=",",
-        engine="python"
-    )
-
-    # 5) Normaliser les noms de colonnes
-    # Par ex. "X_Value" -> "t", "Generateur" -> "gen", "Lumiere" -> "lum"
-    cols_lower = {c.lower(): c for c in df.columns}
 
-    if "x_value" in cols_lower:
-        df = df.rename(columns={cols_lower["x_value"]: "t"})
-    else:
-        raise ValueError(f"Colonne X_Value introuvable dans {filepath}")
-
-    if "generateur" in cols_lower:
-        df = df.rename(columns={cols_lower["generateur"]: "gen"})
-    if "lumiere" in cols_lower:
-        df = df.rename(columns={cols_lower["lumiere"]: "lum"})
-    if "comment" in cols_lower:
-        df = df.rename(columns={cols_lower["comment"]: "comment"})
-
-    # Conversion en float
-    for col in ["t", "gen", "lum"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+def iter_labview_blocks(filepath, chunk_size=100_000):
+    """
+    Lit un fichier LabVIEW par blocs de `chunk_size` lignes, sans jamais le
+    matérialiser en entier : génère des dict {"t": array, "gen": array, "lum": array}.
 
-    return df
+    La mémoire de pointe est bornée par la taille du bloc, pas par celle du fichier.
+    """
+    offset, columns, n_fields = read_table_header(filepath)
+    for chunk in read_table(filepath, offset, columns, n_fields, chunksize=chunk_size):
+        yield {col: chunk[col].to_numpy(dtype=np.float64) for col in chunk.columns}
 
 
 def remove_outliers(df, column="lum", zmax=3.5):
@@ -80,4 +367,27 @@ def remove_outliers(df, column="lum", zmax=3.5):
     z = (data - data.mean()) / data.std(ddof=0)
     mask = np.abs(z) < zmax
     df_clean = df[mask].reset_index(drop=True)
-    return df_clean
\ No newline at end of file
+    return df_clean
+
+
+def iter_remove_outliers(filepath, column="lum", zmax=3.5, chunk_size=100_000):
+    """
+    Version en flux de `remove_outliers` pour les fichiers qui ne tiennent pas en RAM.
+
+    Le z-score dépend de la moyenne et de l'écart-type globaux : une première
+    passe les estime (Welford), une seconde relit le fichier et génère les
+    blocs filtrés. La mémoire reste bornée par `chunk_size`.
+    """
+    stats = RunningStats()
+    for block in iter_labview_blocks(filepath, chunk_size):
+        if column not in block:
+            break
+        stats.update(block[column])
+
+    mean, std = stats.mean, stats.std()
+    for block in iter_labview_blocks(filepath, chunk_size):
+        if column not in block:
+            yield block
+            continue
+        mask = np.abs((block[column] - mean) / std) < zmax
+        yield {col: values[mask] for col, values in block.items()}
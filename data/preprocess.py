@@ -1,26 +1,142 @@
+from itertools import zip_longest
+
 import numpy as np
-import scipy.signal as sg
-from numpy.fft import fft, fftfreq, ifft
+from numpy.fft import rfft, rfftfreq, irfft
+
+from physics.turbulence import turbulence_intensity
+from utils.math_tools import RunningStats
+from utils.profiling import instrument
 
 # ---------- FFT 1D ----------
-def fft_filter(signal, sampling_rate, fmin=None, fmax=None):
-    N = len(signal)
-    spectrum = fft(signal)
-    freqs = fftfreq(N, d=1/sampling_rate)
+def band_slice(freqs, fmin=None, fmax=None):
+    """Indices [i0, i1) des fréquences (croissantes) dans [fmin, fmax]."""
+    i0 = 0 if fmin is None else np.searchsorted(freqs, fmin, side="left")
+    i1 = len(freqs) if fmax is None else np.searchsorted(freqs, fmax, side="right")
+    return slice(i0, i1)
+
 
-    mask = np.ones_like(freqs, dtype=bool)
-    if fmin is not None:
-        mask &= np.abs(freqs) >= fmin
-    if fmax is not None:
-        mask &= np.abs(freqs) <= fmax
+@instrument()
+def fft_filter(signal, sampling_rate, fmin=None, fmax=None, pad=False):
+    """
+    Filtrage passe-bande idéal dans le domaine fréquentiel.
 
-    filtered_spectrum = spectrum * mask
-    filtered_signal = np.real(ifft(filtered_spectrum))
+    Le signal étant réel, on travaille sur le demi-spectre (rfft) : deux fois
+    moins de calcul et de mémoire qu'avec la FFT complexe. Avec pad=True, le
+    signal est complété par des zéros jusqu'à une taille FFT rapide.
+
+    Renvoie (signal filtré, fréquences >= 0, demi-spectre complexe).
+    """
+    N = len(signal)
+    if pad:
+        from scipy.fft import next_fast_len
+        n_fft = next_fast_len(N, real=True)
+    else:
+        n_fft = N
+    spectrum = rfft(signal, n_fft)
+    freqs = rfftfreq(n_fft, d=1/sampling_rate)
+
+    band = band_slice(freqs, fmin, fmax)
+    filtered_spectrum = np.zeros_like(spectrum)
+    filtered_spectrum[band] = spectrum[band]
+    filtered_signal = irfft(filtered_spectrum, n_fft)[:N]
 
     return filtered_signal, freqs, spectrum
 
+
+def spectrum_summary(freqs, spectrum, n_bins=2000):
+    """
+    Résumé décimé du module du spectre pour l'affichage : n_bins classes de
+    fréquences contiguës, avec le max et la moyenne de |spectrum| par classe.
+
+    Renvoie (fréquence centrale, max, moyenne) ; au plus n_bins points.
+    """
+    mag = np.abs(spectrum)
+    if len(mag) <= n_bins:
+        return freqs, mag, mag
+
+    edges = np.linspace(0, len(mag), n_bins + 1).astype(int)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    f_center = (freqs[starts] + freqs[edges[1:] - 1]) / 2
+    return f_center, np.maximum.reduceat(mag, starts), np.add.reduceat(mag, starts) / counts
+
+
+# ---------- Filtrage par blocs (overlap-save) ----------
+def fir_bandpass(sampling_rate, fmin=None, fmax=None, numtaps=1025):
+    """Filtre RIF à phase linéaire (fenêtre de Hamming) pour [fmin, fmax]."""
+    import scipy.signal as sg
+
+    numtaps |= 1  # nombre impair : retard entier de (numtaps - 1) / 2
+    if fmin and fmax:
+        return sg.firwin(numtaps, [fmin, fmax], pass_zero=False, fs=sampling_rate)
+    if fmin:
+        return sg.firwin(numtaps, fmin, pass_zero=False, fs=sampling_rate)
+    if fmax:
+        return sg.firwin(numtaps, fmax, fs=sampling_rate)
+    taps = np.zeros(numtaps)
+    taps[numtaps // 2] = 1.0
+    return taps
+
+
+def iter_fft_filter(blocks, sampling_rate, fmin=None, fmax=None, numtaps=1025):
+    """
+    Filtrage passe-bande en flux (overlap-save) pour les signaux plus grands
+    que la mémoire : consomme des blocs 1D et génère les blocs filtrés.
+
+    Le filtre est un RIF à phase linéaire ; son retard est compensé, donc la
+    sortie est alignée sur l'entrée et a la même longueur totale. La mémoire
+    utilisée ne dépend que de numtaps et de la taille des blocs.
+    """
+    from scipy.fft import next_fast_len
+
+    h = fir_bandpass(sampling_rate, fmin, fmax, numtaps)
+    M = len(h)
+    delay = (M - 1) // 2
+    n_fft = next_fast_len(8 * M, real=True)
+    step = n_fft - (M - 1)
+    H = rfft(h, n_fft)
+
+    buf = np.zeros(M - 1)   # historique (zéros avant le début du signal)
+    skip = delay            # premiers échantillons de sortie = retard du filtre
+    remaining = 0           # échantillons d'entrée pas encore restitués
+
+    def run(buf, final=False):
+        out = []
+        while len(buf) >= n_fft or (final and len(buf) > M - 1):
+            seg = buf[:n_fft]
+            if len(seg) < n_fft:
+                seg = np.concatenate((seg, np.zeros(n_fft - len(seg))))
+            y = irfft(rfft(seg) * H, n_fft)[M - 1:]
+            n_valid = min(step, len(buf) - (M - 1))
+            out.append(y[:n_valid])
+            buf = buf[n_valid:]
+        return out, buf
+
+    def emit(chunks):
+        nonlocal skip, remaining
+        for y in chunks:
+            if skip:
+                cut = min(skip, len(y))
+                y = y[cut:]
+                skip -= cut
+            y = y[:remaining]
+            remaining -= len(y)
+            if len(y):
+                yield y
+
+    for block in blocks:
+        block = np.asarray(block, dtype=float)
+        remaining += len(block)
+        chunks, buf = run(np.concatenate((buf, block)))
+        yield from emit(chunks)
+
+    # Vidange : on pousse `delay` zéros pour sortir la fin du signal
+    chunks, buf = run(np.concatenate((buf, np.zeros(delay))), final=True)
+    yield from emit(chunks)
+
 # ---------- SAVGOL ----------
 def smooth_savgol(signal, window=101, poly=3):
+    import scipy.signal as sg
     return sg.savgol_filter(signal, window_length=window, polyorder=poly)
 
 # ---------- Moyenne glissante ----------
@@ -29,7 +145,9 @@ def running_mean(signal, window=50):
     return np.convolve(signal, kernel, mode='same')
 
 # ---------- Spectrogramme ----------
+@instrument()
 def compute_spectrogram(signal, sampling_rate, nperseg=256, noverlap=128):
+    import scipy.signal as sg
     f, t, Sxx = sg.spectrogram(
         signal,
         fs=sampling_rate,
@@ -38,4 +156,53 @@ def compute_spectrogram(signal, sampling_rate, nperseg=256, noverlap=128):
         scaling='density',
         mode='magnitude'
     )
-    return f, t, Sxx
\ No newline at end of file
+    return f, t, Sxx
+
+# ---------- Statistiques ----------
+def run_stats(sig1, sig2):
+    """
+    Statistiques d'un run P1/P2 : moyennes, variance de P1 et intensité de
+    turbulence TI = std(P1 - P2) / mean(P1) (sur la longueur commune).
+    """
+    return {
+        "mean": np.mean(sig1),
+        "mean_P2": np.mean(sig2),
+        "variance": np.var(sig1),
+        "TI": turbulence_intensity(sig1, sig2),
+    }
+
+
+def stream_run_stats(blocks1, blocks2, column="lum"):
+    """
+    Même résultat que `run_stats`, en une passe sur deux flux de blocs
+    (ex. `iter_labview_blocks` de P1 et P2) : mémoire bornée par le bloc.
+
+    Les deux flux doivent utiliser la même taille de bloc ; comme dans
+    `run_stats`, la TI n'utilise que la longueur commune.
+    """
+    s1, s2, diff = RunningStats(), RunningStats(), RunningStats()
+    for b1, b2 in zip_longest(blocks1, blocks2):
+        x1 = b1[column] if b1 is not None else np.empty(0)
+        x2 = b2[column] if b2 is not None else np.empty(0)
+        n = min(len(x1), len(x2))
+        s1.update(x1)
+        s2.update(x2)
+        diff.update(x1[:n] - x2[:n])
+
+    return {
+        "mean": s1.mean,
+        "mean_P2": s2.mean,
+        "variance": s1.variance(),
+        "TI": diff.std() / s1.mean,
+    }
+
+
+def sampling_rate_from_time(t, n_max=10_000):
+    """
+    Fréquence d'échantillonnage (Hz) déduite de la colonne temps `t` :
+    inverse du pas médian sur les `n_max` premiers échantillons.
+    """
+    dt = np.median(np.diff(np.asarray(t[:n_max], dtype=float)))
+    if not dt > 0:
+        raise ValueError("Colonne temps non croissante : fréquence d'échantillonnage inconnue")
+    return 1 / dt
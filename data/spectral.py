@@ -0,0 +1,57 @@
+import numpy as np
+
+from data.catalog import batch_runs
+from data.preprocess import sampling_rate_from_time
+
+
+def run_spectra(t, sig1, sig2, nperseg=1024, noverlap=None, sampling_rate=None):
+    """
+    Analyse spectrale P1/P2 d'un run (méthode de Welch) :
+      - psd_P1, psd_P2 : densités spectrales de puissance
+      - csd            : interspectre P1 x P2 (complexe)
+      - coherence      : cohérence |csd|**2 / (psd_P1 psd_P2)
+
+    La fréquence d'échantillonnage est lue dans la colonne temps `t` si elle
+    n'est pas fournie. Les signaux sont tronqués à leur longueur commune.
+    """
+    import scipy.signal as sg
+
+    fs = sampling_rate_from_time(t) if sampling_rate is None else sampling_rate
+    n = min(len(sig1), len(sig2))
+    x, y = sig1[:n], sig2[:n]
+    nperseg = min(nperseg, n)
+    kw = dict(fs=fs, nperseg=nperseg, noverlap=noverlap)
+
+    f, pxx = sg.welch(x, **kw)
+    _, pyy = sg.welch(y, **kw)
+    _, pxy = sg.csd(x, y, **kw)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        coh = np.abs(pxy)**2 / (pxx * pyy)
+
+    return {
+        "f": f,
+        "psd_P1": pxx,
+        "psd_P2": pyy,
+        "csd": pxy,
+        "coherence": coh,
+        "sampling_rate": np.float64(fs),
+    }
+
+
+def batch_spectra(catalog, run_ids=None, column="lum", nperseg=1024, noverlap=None,
+                  sampling_rate=None, workers=None, cache_dir=None, use_cache=True,
+                  progress=None):
+    """
+    Spectres de Welch, interspectres et cohérence P1/P2 pour tous les runs
+    d'un RunCatalog, calculés en parallèle (un processus par run).
+
+    Les résultats sont stockés dans un cache disque adressé par contenu
+    (empreinte des signaux + paramètres) : relancer avec les mêmes données
+    et les mêmes paramètres ne recalcule rien.
+
+    Renvoie {run_id: dict de run_spectra}.
+    """
+    params = dict(nperseg=nperseg, noverlap=noverlap, sampling_rate=sampling_rate)
+    return batch_runs(catalog, run_spectra, "spectra", params, run_ids, column, workers,
+                      cache_dir, use_cache, progress)
@@ -1,20 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import os
 import numpy as np
+from collections import deque
 
-from data.loader import load_labview_txt
-from data.preprocess import fft_filter, running_mean, smooth_savgol, compute_spectrogram
-from simulation.montecarlo import mc_from_signals
-from simulation.optimize import optimize_two_turbines
-from utils.plotting import (
-    plot_signal, plot_fft, plot_spectrogram, plot_montecarlo_results, plot_park_positions
-)
-from reporting.pdf_generator import generate_pdf
+from utils.cache import Memo
+from utils.tasks import TaskScheduler
 
-import matplotlib
-matplotlib.use("TkAgg")
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# Les modules de calcul (pandas, scipy, matplotlib, reportlab) sont importés
+# dans les méthodes qui s'en servent : la fenêtre s'ouvre sans les charger.
+
+MAX_REPORT_FIGURES = 12     # figures conservées pour le PDF (les plus récentes)
+LIVE_POLL_MS = 250          # période de lecture des fichiers en suivi direct
+
+
+def tk_plotting():
+    """Charge matplotlib (backend TkAgg) et utils.plotting au premier tracé."""
+    import matplotlib
+    matplotlib.use("TkAgg")
+    import utils.plotting
+    return utils.plotting
 
 
 class WindLabGUI(tk.Tk):
@@ -23,10 +27,20 @@ class WindLabGUI(tk.Tk):
 
         self.title("WindLab – Analyse de Sillage & Optimisation")
         self.geometry("1300x750")
-        self.figures = []       # Figures pour PDF
-        self.runs = {}          # Dictionnaire {run_number: {"P1": df, "P2": df}}
+        self.figures = deque()  # Figures pour PDF (bornées, voir register_figure)
+        self.canvases = {}      # {(conteneur, emplacement): FigureCanvasTkAgg}
+        self.catalog = None     # RunCatalog : index {run_id: {"P1": chemin, "P2": chemin}}
         self.current_P1 = None
         self.current_P2 = None
+        self.current_stats = None
+        self.current_signals = None  # (lum P1, lum P2), vues sans copie des RunData
+
+        self.tasks = TaskScheduler(self)
+        self.memo = Memo()  # Résultats d'analyse par (signal, paramètres)
+        self.current_run_id = None
+        self.live = None        # LiveRun du suivi en direct (None : arrêté)
+        self.live_job = None    # Identifiant du prochain after() de suivi
+        self.build_status_bar()
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True)
@@ -34,6 +48,90 @@ class WindLabGUI(tk.Tk):
         self.tabs = {}
         self.create_tabs()
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        self.tasks.shutdown()
+        self.destroy()
+
+    # -----------------------------------------------------------------------
+    #   STATUS BAR — tâches de fond
+    # -----------------------------------------------------------------------
+    def build_status_bar(self):
+        bar = ttk.Frame(self)
+        bar.pack(side="bottom", fill="x")
+
+        self.status_label = ttk.Label(bar, text="Prêt.")
+        self.status_label.pack(side="left", padx=10)
+
+        ttk.Button(bar, text="Annuler", command=self.cancel_tasks).pack(side="right", padx=10)
+        ttk.Button(bar, text="Profil", command=self.show_profile).pack(side="right")
+        self.progress_bar = ttk.Progressbar(bar, length=200, maximum=1.0)
+        self.progress_bar.pack(side="right", padx=10)
+
+    def run_task(self, key, label, job, on_done):
+        """Lance `job(progress)` en arrière-plan ; `on_done(result)` s'exécute dans Tk."""
+        def progress(done, total):
+            self.progress_bar["value"] = done / total if total else 0
+            self.status_label.config(text=f"{label}… {done}/{total}")
+
+        def done(result):
+            self.progress_bar["value"] = 0
+            self.status_label.config(text="Prêt.")
+            on_done(result)
+
+        def error(exc):
+            self.progress_bar["value"] = 0
+            self.status_label.config(text="Erreur.")
+            messagebox.showerror("Erreur", f"{label} : {exc}")
+
+        self.status_label.config(text=f"{label}…")
+        self.tasks.submit(key, job, on_done=done, on_error=error, on_progress=progress)
+
+    def cancel_tasks(self):
+        self.tasks.cancel()
+        self.progress_bar["value"] = 0
+        self.status_label.config(text="Annulé.")
+
+    # -----------------------------------------------------------------------
+    #   PROFIL DE SESSION
+    # -----------------------------------------------------------------------
+    def show_profile(self):
+        from utils import profiling
+
+        win = tk.Toplevel(self)
+        win.title("Profil de session")
+        text = tk.Text(win, width=110, height=30, font="TkFixedFont")
+        text.pack(fill="both", expand=True)
+
+        def refresh():
+            text.delete("1.0", tk.END)
+            state = "active" if profiling.enabled() else "désactivée"
+            text.insert(tk.END, f"Instrumentation {state}.\n\n{profiling.format_summary()}")
+
+        def toggle(profile=False, memory=False):
+            if profiling.enabled():
+                profiling.disable()
+            else:
+                profiling.enable(profile=profile, memory=memory)
+            refresh()
+
+        def export():
+            path = filedialog.asksaveasfilename(defaultextension=".json", title="Exporter le profil")
+            if path:
+                profiling.dump_json(path)
+
+        buttons = ttk.Frame(win)
+        buttons.pack(fill="x")
+        ttk.Button(buttons, text="Activer / désactiver", command=toggle).pack(side="left")
+        ttk.Button(buttons, text="Activer + cProfile + mémoire",
+                   command=lambda: toggle(profile=True, memory=True)).pack(side="left")
+        ttk.Button(buttons, text="Rafraîchir", command=refresh).pack(side="left")
+        ttk.Button(buttons, text="Réinitialiser",
+                   command=lambda: (profiling.reset(), refresh())).pack(side="left")
+        ttk.Button(buttons, text="Exporter JSON", command=export).pack(side="right")
+        refresh()
+
     # -----------------------------------------------------------------------
     #   TABS CREATION
     # -----------------------------------------------------------------------
@@ -66,11 +164,16 @@ class WindLabGUI(tk.Tk):
         frame = self.tabs["DATA"]
 
         ttk.Button(frame, text="Charger dossier TXT", command=self.load_directory).pack(pady=10)
+        ttk.Button(frame, text="Pré-charger tous les runs", command=self.prefetch_runs).pack()
 
         self.run_listbox = tk.Listbox(frame, width=40, height=15)
         self.run_listbox.pack(pady=10)
         self.run_listbox.bind("<<ListboxSelect>>", self.on_run_select)
 
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame, text="Suivi en direct (acquisition en cours)",
+                        variable=self.live_var, command=self.toggle_live).pack()
+
         self.data_stats_label = ttk.Label(frame, text="Aucune donnée chargée.")
         self.data_stats_label.pack()
 
@@ -82,33 +185,30 @@ class WindLabGUI(tk.Tk):
         if not directory:
             return
 
-        self.runs = {}
+        self.tasks.cancel()
         self.run_listbox.delete(0, tk.END)
 
-        files = sorted(f for f in os.listdir(directory) if f.endswith(".txt"))
-
-        for f in files:
-            # Format : Run_34 1 P1.txt
-            name = f.replace(".txt", "")
-            parts = name.split()
-
-            if len(parts) < 3:
-                continue
+        from data.catalog import RunCatalog
 
-            run_id = parts[1]
-            turbine = parts[2]  # "P1" / "P2"
+        # Seuls les noms de fichiers sont indexés : les runs sont parsés à la sélection
+        self.catalog = RunCatalog(directory)
 
-            if run_id not in self.runs:
-                self.runs[run_id] = {}
+        for run in self.catalog.run_ids():
+            self.run_listbox.insert(tk.END, f"Run {run}")
 
-            full_path = os.path.join(directory, f)
-            self.runs[run_id][turbine] = load_labview_txt(full_path)
+        self.data_stats_label.config(text=f"{len(self.catalog.run_ids())} runs indexés.")
 
-        for run in self.runs.keys():
-            if "P1" in self.runs[run] and "P2" in self.runs[run]:
-                self.run_listbox.insert(tk.END, f"Run {run}")
+    def prefetch_runs(self):
+        if self.catalog is None:
+            return messagebox.showerror("Erreur", "Aucun dossier chargé.")
 
-        messagebox.showinfo("OK", "Données chargées avec succès !")
+        # Parsing en parallèle : remplit le cache disque, la mémoire reste bornée (LRU)
+        catalog = self.catalog
+        self.run_task(
+            "prefetch", "Chargement des runs",
+            lambda progress: catalog.prefetch(progress=progress),
+            lambda _: self.data_stats_label.config(text=f"{len(catalog.run_ids())} runs prêts."),
+        )
 
     def on_run_select(self, event):
         selection = self.run_listbox.curselection()
@@ -119,24 +219,123 @@ class WindLabGUI(tk.Tk):
         label = self.run_listbox.get(index)
         run_id = label.split()[1]
 
-        self.current_P1 = self.runs[run_id]["P1"]
-        self.current_P2 = self.runs[run_id]["P2"]
+        # Les calculs lancés sur le run précédent sont périmés
+        self.tasks.cancel("corr", "fft", "spectro", "mc", "sweep", "opt")
+        self.stop_live()
 
-        sig1 = self.current_P1["lum"].astype(float).values
-        sig2 = self.current_P2["lum"].astype(float).values
+        from data.preprocess import run_stats
+        catalog, memo = self.catalog, self.memo
 
-        fig = plot_signal(sig1, sig2, title=f"Run {run_id} — Lumière P1 (bleu) vs P2 (orange)")
-        self.display_plot(self.data_plot_container, fig)
-        self.figures.append(fig)
+        def load(progress):
+            # Le hachage des signaux (clé du memo) et les statistiques restent hors du thread Tk
+            run = catalog.get(run_id)
+            return run, memo.call(run_stats, run["P1"].lum, run["P2"].lum)
+
+        self.run_task(
+            "run", f"Chargement du run {run_id}", load,
+            lambda result: self.show_run(run_id, *result),
+        )
+
+    def show_run(self, run_id, run, stats):
+        self.current_run_id = run_id
+        self.current_P1 = run["P1"]
+        self.current_P2 = run["P2"]
+
+        sig1 = self.current_P1.lum
+        sig2 = self.current_P2.lum
+        self.current_signals = (sig1, sig2)
+
+        plotting = tk_plotting()
+
+        title = f"Run {run_id} — Lumière P1 (bleu) vs P2 (orange)"
+        fig = self.shown_figure(self.data_plot_container)
+        if fig is not None and plotting.update_signal(fig, sig1, sig2, title=title):
+            # Même tracé, nouvelles données : mise à jour en place
+            fig.canvas.draw_idle()
+        else:
+            fig = plotting.plot_signal(sig1, sig2, title=title)
+            self.display_plot(self.data_plot_container, fig)
+        self.register_figure(fig)
+
+        self.current_stats = stats
+
+        text = f"P1 mean={stats['mean']:.3f} | P2 mean={stats['mean_P2']:.3f} | TI={stats['TI']:.3f}"
+        self.data_stats_label.config(text=text)
+
+        # Retard de propagation P1 -> P2 (corrélation croisée FFT), en fond
+        from data.correlation import run_correlation
+        t = self.current_P1.t
+        self.run_task(
+            "corr", "Corrélation P1/P2",
+            lambda progress: self.memo.call(run_correlation, t, sig1, sig2, max_lag=5.0),
+            lambda corr: self.data_stats_label.config(
+                text=f"{text} | retard={corr['lag']:.3f} s | corr={corr['peak']:.2f}"
+            ),
+        )
+
+    # ---------- Suivi en direct ----------
+    def toggle_live(self):
+        if not self.live_var.get():
+            return self.stop_live()
+        if self.catalog is None or self.current_run_id is None:
+            self.live_var.set(False)
+            return messagebox.showerror("Erreur", "Sélectionne un run.")
+
+        from data.live import LiveRun
+        self.live = LiveRun(self.catalog.index[self.current_run_id])
+        self.poll_live()
+
+    def stop_live(self):
+        if self.live_job is not None:
+            self.after_cancel(self.live_job)
+        self.live_job = None
+        self.live = None
+        self.live_var.set(False)
+
+    def poll_live(self):
+        """
+        Lit les lignes ajoutées depuis le dernier passage et met à jour les
+        tracés en place. Chaque passage lit au plus ~1 Mo par fichier : il
+        reste court même si le fichier est long, et on repasse aussitôt tant
+        qu'il reste du retard à rattraper.
+        """
+        live = self.live
+        if live is None:
+            return
+
+        if live.update():
+            self.show_live(live)
+        self.live_job = self.after(1 if live.behind else LIVE_POLL_MS, self.poll_live)
+
+    def show_live(self, live):
+        plotting = tk_plotting()
+        sig1, sig2 = live.signals()
+        stats = live.run_stats()
 
-        mean1 = np.mean(sig1)
-        mean2 = np.mean(sig2)
-        TI = np.std(sig1 - sig2) / mean1
+        title = f"Run {self.current_run_id} — suivi en direct"
+        fig = self.shown_figure(self.data_plot_container)
+        if fig is not None and plotting.update_signal(fig, sig1, sig2, title=title):
+            fig.canvas.draw_idle()
+        else:
+            fig = plotting.plot_signal(sig1, sig2, title=title)
+            self.display_plot(self.data_plot_container, fig)
+            self.register_figure(fig)
 
         self.data_stats_label.config(
-            text=f"P1 mean={mean1:.3f} | P2 mean={mean2:.3f} | TI={TI:.3f}"
+            text=f"P1 mean={stats['mean']:.3f} | P2 mean={stats['mean_P2']:.3f} | "
+                 f"TI={stats['TI']:.3f} | {stats['n_P1']} échantillons"
         )
 
+        if live.spectrogram is not None:
+            f, t, Sxx = live.spectrogram.spectrogram()
+            fig = self.shown_figure(self.spectro_plot_container)
+            if fig is not None and plotting.update_spectrogram(fig, f, t, Sxx):
+                fig.canvas.draw_idle()
+            else:
+                fig = plotting.plot_spectrogram(f, t, Sxx, title="Spectrogramme en direct — Lumière P2")
+                self.display_plot(self.spectro_plot_container, fig)
+                self.register_figure(fig)
+
     # -----------------------------------------------------------------------
     #   TAB 2 — FFT & Filtrage
     # -----------------------------------------------------------------------
@@ -173,16 +372,25 @@ class WindLabGUI(tk.Tk):
         except:
             return messagebox.showerror("Erreur", "Paramètres FFT invalides.")
 
-        sig = self.current_P2["lum"].astype(float).values
-        filtered, freqs, spectrum = fft_filter(sig, sampling_rate=1000, fmin=fmin, fmax=fmax)
+        from data.preprocess import fft_filter, spectrum_summary
+        sig = self.current_signals[1]
+
+        def job(progress):
+            filtered, freqs, spectrum = self.memo.call(fft_filter, sig, sampling_rate=1000, fmin=fmin, fmax=fmax)
+            return filtered, self.memo.call(spectrum_summary, freqs, spectrum)
+
+        self.run_task("fft", "FFT + filtrage", job, lambda result: self.show_fft(sig, *result))
 
-        fig_sig = plot_signal(sig, filtered, title="Signal filtré FFT")
-        fig_fft = plot_fft(freqs, spectrum)
+    def show_fft(self, sig, filtered, summary):
+        plotting = tk_plotting()
+        fig_sig = plotting.plot_signal(sig, filtered, title="Signal filtré FFT")
+        fig_fft = plotting.plot_fft(*summary)
 
-        self.display_plot(self.fft_plot_container, fig_sig)
-        self.display_plot(self.fft_plot_container, fig_fft)
+        self.display_plot(self.fft_plot_container, fig_sig, slot=0)
+        self.display_plot(self.fft_plot_container, fig_fft, slot=1)
 
-        self.figures.extend([fig_sig, fig_fft])
+        self.register_figure(fig_sig)
+        self.register_figure(fig_fft)
         self.filtered_signal = filtered
 
     # -----------------------------------------------------------------------
@@ -200,12 +408,18 @@ class WindLabGUI(tk.Tk):
         if self.current_P2 is None:
             return messagebox.showerror("Erreur", "Sélectionne un run.")
 
-        sig = self.current_P2["lum"].astype(float).values
-        f, t, Sxx = compute_spectrogram(sig, sampling_rate=1000)
+        from data.preprocess import compute_spectrogram
+        sig = self.current_signals[1]
+        self.run_task(
+            "spectro", "Spectrogramme",
+            lambda progress: self.memo.call(compute_spectrogram, sig, sampling_rate=1000),
+            lambda result: self.show_spectrogram_result(*result),
+        )
 
-        fig = plot_spectrogram(f, t, Sxx, title="Spectrogramme — Lumière P2")
+    def show_spectrogram_result(self, f, t, Sxx):
+        fig = tk_plotting().plot_spectrogram(f, t, Sxx, title="Spectrogramme — Lumière P2")
         self.display_plot(self.spectro_plot_container, fig)
-        self.figures.append(fig)
+        self.register_figure(fig)
 
     # -----------------------------------------------------------------------
     #   TAB 4 — MONTE CARLO
@@ -214,6 +428,7 @@ class WindLabGUI(tk.Tk):
         frame = self.tabs["Monte-Carlo"]
 
         ttk.Button(frame, text="Lancer Monte-Carlo", command=self.run_mc).pack(pady=10)
+        ttk.Button(frame, text="Balayage d'espacement (sillage)", command=self.run_sweep).pack()
         self.mc_plot_container = ttk.Frame(frame)
         self.mc_plot_container.pack(fill="both", expand=True)
 
@@ -221,14 +436,38 @@ class WindLabGUI(tk.Tk):
         if (self.current_P1 is None) or (self.current_P2 is None):
             return messagebox.showerror("Erreur", "Sélectionne un run.")
 
-        P1 = self.current_P1["lum"].astype(float).values
-        P2 = self.current_P2["lum"].astype(float).values
+        P1, P2 = self.current_signals
+
+        from simulation.montecarlo import mc_from_signals
+        self.run_task(
+            "mc", "Monte-Carlo",
+            lambda progress: self.memo.call(mc_from_signals, P1, P2, N=2000, seed=0),
+            self.show_mc,
+        )
+
+    def run_sweep(self):
+        if self.current_stats is None:
+            return messagebox.showerror("Erreur", "Sélectionne un run.")
+
+        U0 = self.current_stats["mean"]
+        sigma = np.sqrt(self.current_stats["variance"])
+
+        from simulation.montecarlo import spacing_sweep
+        self.run_task(
+            "sweep", "Balayage d'espacement",
+            lambda progress: self.memo.call(spacing_sweep, U0, sigma, lateral_std=0.5, seed=0),
+            lambda result: self.show_sweep(*result),
+        )
 
-        results = mc_from_signals(P1, P2, N=2000)
+    def show_sweep(self, results, bands):
+        fig = tk_plotting().plot_montecarlo_results(results, bands)
+        self.display_plot(self.mc_plot_container, fig, slot=1)
+        self.register_figure(fig)
 
-        fig = plot_signal(results, title="Distribution Monte-Carlo (puissance simulée)")
+    def show_mc(self, results):
+        fig = tk_plotting().plot_signal(results, title="Distribution Monte-Carlo (puissance simulée)")
         self.display_plot(self.mc_plot_container, fig)
-        self.figures.append(fig)
+        self.register_figure(fig)
 
     # -----------------------------------------------------------------------
     #   TAB 5 — OPTIMISATION PARC
@@ -244,14 +483,22 @@ class WindLabGUI(tk.Tk):
         if self.current_P1 is None:
             return messagebox.showerror("Erreur", "Sélectionne un run.")
 
-        U0 = np.mean(self.current_P1["lum"].astype(float).values)
-        var = np.var(self.current_P1["lum"].astype(float).values)
+        U0 = self.current_stats["mean"]
+        var = self.current_stats["variance"]
 
-        score, pos = optimize_two_turbines(U0, var, iterations=1500)
+        from simulation.optimize import optimize_two_turbines
+        self.run_task(
+            "opt", "Optimisation",
+            lambda progress: self.memo.call(
+                optimize_two_turbines, U0, var, iterations=1500, seed=0, progress=progress
+            ),
+            lambda result: self.show_opt(*result),
+        )
 
-        fig = plot_park_positions(pos)
+    def show_opt(self, score, pos):
+        fig = tk_plotting().plot_park_positions(pos)
         self.display_plot(self.opt_plot_container, fig)
-        self.figures.append(fig)
+        self.register_figure(fig)
 
     # -----------------------------------------------------------------------
     #   TAB 6 — EXPORT PDF
@@ -271,26 +518,78 @@ class WindLabGUI(tk.Tk):
         if not path:
             return
 
-       # On limite le nombre de figures pour correspondre à la signature de generate_pdf
-        figs_for_pdf = self.figures[:4]   # <= maximum 4 images
+        from reporting.pdf_generator import generate_pdf, campaign_sections, snapshot_figures
 
-        stats = {
-            "mean": 0,
-            "variance": 0,
-            "TI": 0
-        }
+        # Statistiques du run courant, puis une section par run de la campagne.
+        # Les figures sont copiées ici (thread Tk) ; parsing des runs et rendu
+        # se font en fond, dans des processus séparés
+        stats = self.current_stats or {"mean": 0, "variance": 0, "TI": 0}
+        figures = snapshot_figures(self.figures)
+        catalog = self.catalog
 
-        generate_pdf(path, stats, *figs_for_pdf)
-        messagebox.showinfo("OK", "PDF généré.")
+        def job(progress):
+            sections = campaign_sections(catalog, progress=progress) if catalog is not None else ()
+            generate_pdf(path, stats, *figures, sections=sections, isolate=True)
+            return path
+
+        self.run_task("pdf", "Export PDF", job, lambda _: messagebox.showinfo("OK", "PDF généré."))
 
     # -----------------------------------------------------------------------
     # DISPLAY UTILITY
     # -----------------------------------------------------------------------
-    def display_plot(self, parent, fig):
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        widget = canvas.get_tk_widget()
-        widget.pack(fill="both", expand=True)
-        canvas.draw()
+    def display_plot(self, parent, fig, slot=0):
+        """
+        Affiche `fig` dans `parent`. Chaque emplacement garde un seul canvas Tk,
+        réutilisé d'un affichage à l'autre ; la figure remplacée est fermée
+        si elle n'est plus référencée (ni affichée, ni gardée pour le PDF).
+        """
+        key = (str(parent), slot)
+        canvas = self.canvases.get(key)
+
+        if canvas is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+            canvas = FigureCanvasTkAgg(fig, master=parent)
+            # Barre zoom / déplacement : les courbes décimées se recalculent au zoom
+            NavigationToolbar2Tk(canvas, parent, pack_toolbar=False).pack(fill="x")
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+            self.canvases[key] = canvas
+        elif canvas.figure is not fig:
+            old = canvas.figure
+            widget = canvas.get_tk_widget()
+            canvas.figure = fig
+            fig.set_canvas(canvas)
+            # La figure remplacée reçoit son propre canvas : sinon, gardée pour
+            # le PDF, son savefig rendrait la figure affichée à sa place
+            from matplotlib.backend_bases import FigureCanvasBase
+            FigureCanvasBase(old)
+            if widget.winfo_width() > 1:
+                fig.set_size_inches(widget.winfo_width() / fig.dpi,
+                                    widget.winfo_height() / fig.dpi, forward=False)
+            if canvas.toolbar is not None:
+                canvas.toolbar.update()  # Pile zoom / déplacement de l'ancienne figure
+            self.release_figure(old)
+
+        canvas.draw_idle()
+
+    def shown_figure(self, parent, slot=0):
+        canvas = self.canvases.get((str(parent), slot))
+        return None if canvas is None else canvas.figure
+
+    def register_figure(self, fig):
+        """Garde `fig` pour le PDF ; au-delà de MAX_REPORT_FIGURES, la plus ancienne sort."""
+        if fig in self.figures:
+            return
+        self.figures.append(fig)
+        while len(self.figures) > MAX_REPORT_FIGURES:
+            self.release_figure(self.figures.popleft())
+
+    def release_figure(self, fig):
+        if fig in self.figures:
+            return
+        if any(c.figure is fig for c in self.canvases.values()):
+            return
+        import matplotlib.pyplot as plt
+        plt.close(fig)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+# ---------- Intensité de turbulence mesurée ----------
+def turbulence_intensity(signal, reference=None):
+    """
+    TI = std(signal - reference) / mean(signal), sur la longueur commune.
+
+    Sans `reference`, c'est la TI classique std(signal) / mean(signal).
+    """
+    signal = np.asarray(signal, dtype=float)
+    if reference is None:
+        return np.std(signal) / np.mean(signal)
+
+    n = min(len(signal), len(reference))
+    return np.std(signal[:n] - np.asarray(reference[:n], dtype=float)) / np.mean(signal)
+
+
+def rolling_mean_std(x, window, step=1):
+    """
+    Moyenne et écart-type glissants sur des fenêtres de `window` points,
+    une fenêtre tous les `step` points (fenêtres complètes uniquement).
+
+    O(n) quelle que soit la fenêtre : sommes cumulées de x et x**2. Le signal
+    est recentré sur sa moyenne avant cumul pour limiter les erreurs
+    d'arrondi (la variance est une différence de grands nombres sinon).
+    """
+    x = np.asarray(x, dtype=float)
+    window = int(window)
+    if window < 1 or window > len(x):
+        empty = np.empty(0)
+        return empty, empty
+
+    shift = x.mean()
+    y = x - shift
+    c1 = np.concatenate(([0.0], np.cumsum(y)))
+    c2 = np.concatenate(([0.0], np.cumsum(y*y)))
+
+    s1 = c1[window::step] - c1[:-window:step]
+    s2 = c2[window::step] - c2[:-window:step]
+    mean = s1 / window
+    var = np.maximum(s2 / window - mean**2, 0.0)
+    return mean + shift, np.sqrt(var)
+
+
+def rolling_ti(signal, window, reference=None, step=1):
+    """
+    TI glissante : std(signal - reference) / mean(signal) par fenêtre,
+    même définition que `turbulence_intensity` (longueur commune si
+    `reference` est donné). Renvoie un array de len(signal) - window + 1
+    valeurs (divisé par `step`).
+    """
+    signal = np.asarray(signal, dtype=float)
+    if reference is not None:
+        n = min(len(signal), len(reference))
+        signal = signal[:n]
+        fluct = signal - np.asarray(reference[:n], dtype=float)
+        _, std = rolling_mean_std(fluct, window, step)
+        mean, _ = rolling_mean_std(signal, window, step)
+    else:
+        mean, std = rolling_mean_std(signal, window, step)
+    return std / mean
+
+
+# ---------- Turbulence ajoutée par les sillages ----------
+def axial_induction(Ct):
+    """Facteur d'induction axiale a, avec Ct = 4a(1 - a)."""
+    return 0.5 * (1 - np.sqrt(1 - np.asarray(Ct, dtype=float)))
+
+
+def wake_expansion(I):
+    """
+    Taux d'expansion k du sillage gaussien en fonction de la TI locale
+    (Niayifar & Porté-Agel 2016) : k = 0.3837 I + 0.003678.
+    """
+    return 0.3837 * np.asarray(I, dtype=float) + 0.003678
+
+
+class AddedTurbulence(ABC):
+    """
+    Interface commune des modèles de turbulence ajoutée par un sillage.
+
+    added(Ct, x, I0) : TI ajoutée à une distance aval x (m) d'une turbine de
+    coefficient de poussée Ct, sous une TI ambiante I0. Les points amont
+    (x <= 0) ne reçoivent rien. Tous les arguments sont diffusés.
+    La distance est bornée à `x_min` diamètres : les corrélations ne sont
+    pas valables dans le sillage proche et divergent en x -> 0.
+    """
+
+    x_min = 2.0
+
+    def __init__(self, D=100):
+        self.D = D
+
+    def _distance(self, x):
+        x = np.asarray(x, dtype=float)
+        return x > 0, np.maximum(x / self.D, self.x_min)
+
+    @abstractmethod
+    def added(self, Ct, x, I0):
+        """TI ajoutée, nulle en amont (x <= 0)."""
+
+    def __call__(self, Ct, x, I0):
+        return self.added(Ct, x, I0)
+
+
+class CrespoHernandez(AddedTurbulence):
+    """Crespo & Hernández (1996) : 0.73 a^0.8325 I0^0.0325 (x/D)^-0.32."""
+
+    def added(self, Ct, x, I0):
+        downstream, xd = self._distance(x)
+        a = axial_induction(Ct)
+        dI = 0.73 * a**0.8325 * np.asarray(I0, dtype=float)**0.0325 * xd**-0.32
+        return np.where(downstream, dI, 0.0)
+
+
+class Frandsen(AddedTurbulence):
+    """Frandsen (2007) : 1 / (1.5 + 0.8 (x/D) / sqrt(Ct)), indépendant de I0."""
+
+    def added(self, Ct, x, I0=None):
+        downstream, xd = self._distance(x)
+        dI = 1 / (1.5 + 0.8 * xd / np.sqrt(np.asarray(Ct, dtype=float)))
+        return np.where(downstream, dI, 0.0)
+
+
+def crespo_hernandez(Ct, x, I0, D):
+    return CrespoHernandez(D)(Ct, x, I0)
+
+
+def frandsen(Ct, x, D):
+    return Frandsen(D)(Ct, x, None)
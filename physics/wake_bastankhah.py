@@ -1,15 +1,36 @@
 import numpy as np
 
+from physics.wake_model import WakeModel
+
+
 def sigma(x, D, k=0.05):
     return k*x + D/np.sqrt(8)
 
-def bastankhah(U0, Ct, x, r, D, k=0.05):
-    if x <= 0:
-        return U0
 
-    eps = (D / (D + 2*k*x))**2
-    sig = sigma(x, D, k)
-    gauss = np.exp(-(r**2) / (2*sig**2))
-    deficit = (1 - np.sqrt(1 - Ct)) * eps * gauss
+class BastankhahWake(WakeModel):
+    """Sillage gaussien (Bastankhah & Porté-Agel 2014)."""
+
+    n_sigma = 3  # au-delà de 3 sigma, le déficit est < 1.2 % du déficit axial
+
+    def shape(self, x, r, k=None):
+        k = self.k if k is None else k
+        x = np.asarray(x, dtype=float)
+        downstream = x > 0
+        xp = np.where(downstream, x, 0.0)
 
-    return U0 * (1 - deficit)
\ No newline at end of file
+        eps = (self.D / (self.D + 2*k*xp))**2
+        sig = sigma(xp, self.D, k)
+        gauss = np.exp(-np.asarray(r, dtype=float)**2 / (2*sig**2))
+        return np.where(downstream, eps * gauss, 0.0)
+
+    def radius(self, x, k=None):
+        k = self.k if k is None else k
+        return self.n_sigma * sigma(np.maximum(x, 0), self.D, k)
+
+
+def bastankhah(U0, Ct, x, r, D, k=0.05):
+    """
+    Vitesse dans le sillage gaussien. U0, Ct, x et r peuvent être des arrays
+    (diffusés entre eux) ; les points amont (x <= 0) gardent U0.
+    """
+    return BastankhahWake(D, k)(U0, Ct, x, r)
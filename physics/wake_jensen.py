@@ -1,9 +1,31 @@
 import numpy as np
 
-def jensen(U0, Ct, x, D, k=0.05):
-    if x <= 0:
-        return U0
+from physics.wake_model import WakeModel
 
-    eps = (1 + k * x / D)**2
-    deficit = (1 - np.sqrt(1 - Ct)) / eps
-    return U0 * (1 - deficit)
\ No newline at end of file
+
+class JensenWake(WakeModel):
+    """
+    Sillage top-hat de Jensen / Park : déficit uniforme dans un cône de
+    rayon (D/2)(1 + kx/D), cohérent avec le facteur de dilution (1 + kx/D)**2.
+    """
+
+    def shape(self, x, r, k=None):
+        k = self.k if k is None else k
+        x = np.asarray(x, dtype=float)
+        xp = np.where(x > 0, x, 0.0)
+
+        eps = (1 + k * xp / self.D)**2
+        inside = (x > 0) & (np.abs(r) <= self.radius(xp, k))
+        return np.where(inside, 1 / eps, 0.0)
+
+    def radius(self, x, k=None):
+        k = self.k if k is None else k
+        return self.D / 2 * (1 + k * np.maximum(x, 0) / self.D)
+
+
+def jensen(U0, Ct, x, D, k=0.05, r=0):
+    """
+    Vitesse dans le sillage de Jensen. U0, Ct, x et r peuvent être des arrays ;
+    les points amont (x <= 0) gardent U0. Par défaut r=0 (axe du sillage).
+    """
+    return JensenWake(D, k)(U0, Ct, x, r)
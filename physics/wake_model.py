@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+def as_result(value):
+    """Renvoie un scalaire si tous les arguments étaient scalaires, sinon l'array."""
+    value = np.asarray(value)
+    return value[()] if value.ndim == 0 else value
+
+
+class WakeModel(ABC):
+    """
+    Interface commune des modèles de sillage.
+
+    Le déficit de vitesse se factorise en  amplitude(Ct) * shape(x, r) :
+      - x : distance aval (m), r : distance radiale à l'axe du sillage (m)
+      - les points amont (x <= 0) ont un déficit nul
+    Tous les arguments sont diffusés (broadcasting numpy) : un appel suffit
+    pour une grille ou un parc entier.
+    """
+
+    def __init__(self, D=100, k=0.05):
+        self.D = D
+        self.k = k
+
+    def amplitude(self, Ct):
+        return 1 - np.sqrt(1 - np.asarray(Ct, dtype=float))
+
+    @abstractmethod
+    def shape(self, x, r, k=None):
+        """Forme du déficit, normalisée par l'amplitude."""
+
+    @abstractmethod
+    def radius(self, x, k=None):
+        """Rayon au-delà duquel le déficit est négligeable (cône de sillage)."""
+
+    def deficit(self, Ct, x, r, k=None):
+        return self.amplitude(Ct) * self.shape(x, r, k)
+
+    def velocity(self, U0, Ct, x, r=0, k=None):
+        return np.asarray(U0, dtype=float) * (1 - self.deficit(Ct, x, r, k))
+
+    def __call__(self, U0, Ct, x, r=0, k=None):
+        return as_result(self.velocity(U0, Ct, x, r, k))
@@ -1,7 +1,27 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
-import matplotlib.pyplot as plt
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.profiling import instrument
+
+# Libellés des statistiques connues (les autres clés sont affichées telles quelles)
+STAT_LABELS = {
+    "mean": "Vitesse moyenne",
+    "mean_P2": "Vitesse moyenne P2",
+    "variance": "Variance",
+    "TI": "Turbulence Intensity",
+}
+
+IMG_WIDTH = 500
+IMG_HEIGHT = 250
+
 
 def fig_to_img(fig):
     import io
@@ -10,27 +30,195 @@ def fig_to_img(fig):
     buf.seek(0)
     return buf
 
-def generate_pdf(output_path, stats, fig1=None, fig2=None, fig3=None, fig4=None):
-    c = canvas.Canvas(output_path, pagesize=A4)
-    width, height = A4
-
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, height-50, "Rapport WindLab – Analyse PIV & Optimisation")
-
-    c.setFont("Helvetica", 12)
-    c.drawString(50, height-100, f"Vitesse moyenne : {stats['mean']:.3f}")
-    c.drawString(50, height-120, f"Variance : {stats['variance']:.3f}")
-    c.drawString(50, height-140, f"Turbulence Intensity : {stats['TI']:.3f}")
-
-    y = height - 200
-    for fig in [fig1, fig2, fig3, fig4]:
-        if fig is None:
-            continue
-        img = ImageReader(fig_to_img(fig))
-        c.drawImage(img, 50, y-250, width=500, height=250)
-        y -= 260
-        if y < 100:
-            c.showPage()
-            y = height - 100
-
-    c.save()
\ No newline at end of file
+
+class ReportSection:
+    """Section du rapport : un titre, des statistiques, des figures, du texte."""
+
+    def __init__(self, title, stats=None, figures=(), text=None):
+        self.title = title
+        self.stats = stats or {}
+        self.figures = [f for f in figures if f is not None]
+        self.text = text
+
+
+# ---------- Rendu des figures ----------
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_figure(args):
+    data, path, dpi = args
+    import matplotlib.pyplot as plt
+
+    fig = pickle.loads(data)
+    fig.savefig(path, format="png", dpi=dpi)
+    plt.close(fig)
+    return path
+
+
+def snapshot_figures(figures):
+    """
+    Copies picklées des figures, à passer à `render_figures` / `generate_pdf`
+    à la place des figures : le rendu peut alors se faire depuis un thread de
+    fond sans toucher aux figures affichées (à appeler dans le thread Tk).
+    """
+    return [pickle.dumps(fig) for fig in figures if fig is not None]
+
+
+def _bounded_map(pool, fn, items, window):
+    """
+    Comme pool.map, mais au plus `window` tâches en vol : les figures picklées
+    ne sont pas toutes gardées en attente dans l'exécuteur. Résultats dans
+    l'ordre ; les tâches restantes sont annulées si le consommateur s'arrête.
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+def render_figures(figures, directory, dpi=150, workers=None, isolate=False):
+    """
+    Rastérise les figures en PNG dans `directory`, en parallèle (processus
+    "spawn" avec backend Agg : aucune interaction avec l'interface Tk).
+    Génère les chemins des fichiers dans l'ordre des figures, au fil de l'eau,
+    avec au plus 2 * workers figures en cours de rendu.
+
+    `figures` : figures matplotlib ou copies de `snapshot_figures`. Avec
+    isolate=True, le rendu se fait toujours dans un processus séparé, même
+    pour une seule figure ou un seul cœur (appel depuis un thread de fond).
+    """
+    paths = [os.path.join(directory, f"fig_{i:05d}.png") for i in range(len(figures))]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isolate and (workers <= 1 or len(figures) <= 1):
+        for fig, path in zip(figures, paths):
+            if isinstance(fig, bytes):
+                yield _render_figure((fig, path, dpi))
+            else:
+                fig.savefig(path, format="png", dpi=dpi)
+                yield path
+        return
+
+    def tasks():
+        for fig, path in zip(figures, paths):
+            yield (fig if isinstance(fig, bytes) else pickle.dumps(fig)), path, dpi
+
+    workers = max(1, min(workers, len(figures)))
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool:
+        yield from _bounded_map(pool, _render_figure, tasks(), 2 * workers)
+
+
+# ---------- Mise en page ----------
+class _PageWriter:
+    def __init__(self, output_path):
+        self.c = canvas.Canvas(output_path, pagesize=A4)
+        self.width, self.height = A4
+        self.y = self.height - 50
+
+    def need(self, h):
+        if self.y - h < 50:
+            self.c.showPage()
+            self.y = self.height - 50
+
+    def line(self, text, font="Helvetica", size=12, step=20):
+        self.need(step)
+        self.c.setFont(font, size)
+        self.c.drawString(50, self.y, text)
+        self.y -= step
+
+    def image(self, path):
+        self.need(IMG_HEIGHT + 10)
+        self.c.drawImage(ImageReader(path), 50, self.y - IMG_HEIGHT,
+                         width=IMG_WIDTH, height=IMG_HEIGHT)
+        self.y -= IMG_HEIGHT + 10
+
+    def save(self):
+        self.c.save()
+
+
+def _format_stat(value):
+    try:
+        return f"{float(value):.3f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+@instrument()
+def build_report(output_path, sections, title="Rapport WindLab – Analyse PIV & Optimisation",
+                 dpi=150, workers=None, isolate=False):
+    """
+    Rapport PDF avec un nombre quelconque de sections et de figures.
+
+    Les figures sont rastérisées en parallèle vers des fichiers temporaires,
+    puis insérées une à une dans l'ordre : les PNG décodés ne sont jamais
+    tous en mémoire. ReportLab garde en revanche chaque image insérée
+    (compressée) jusqu'à `save()` : la mémoire croît avec la taille du PDF.
+    """
+    figures = [fig for s in sections for fig in s.figures]
+    out = _PageWriter(output_path)
+    out.line(title, font="Helvetica-Bold", size=18, step=50)
+
+    with tempfile.TemporaryDirectory(prefix="windlab_pdf_") as tmp:
+        images = render_figures(figures, tmp, dpi=dpi, workers=workers, isolate=isolate)
+
+        for section in sections:
+            if section.title:
+                out.line(section.title, font="Helvetica-Bold", size=14, step=25)
+            for key, value in section.stats.items():
+                out.line(f"{STAT_LABELS.get(key, key)} : {_format_stat(value)}")
+            if section.text:
+                for text in section.text.splitlines():
+                    out.line(text, size=10, step=14)
+            if section.stats or section.text:
+                out.y -= 20
+
+            for _ in section.figures:
+                path = next(images)
+                out.image(path)
+                os.remove(path)
+
+        out.save()
+
+
+def _section_task(args):
+    run_id, paths, column = args
+    from data.loader import load_labview_arrays
+    from data.preprocess import run_stats
+
+    p1 = load_labview_arrays(paths["P1"], mmap_mode="r")[column]
+    p2 = load_labview_arrays(paths["P2"], mmap_mode="r")[column]
+    return run_id, run_stats(p1, p2)
+
+
+def campaign_sections(catalog, run_ids=None, column="lum", progress=None):
+    """
+    Une section de statistiques (run_stats) par run d'un RunCatalog ; les
+    runs sont parsés en parallèle (`catalog.workers` processus).
+    """
+    from utils.tasks import run_tasks
+
+    run_ids = run_ids or catalog.run_ids()
+    tasks = [(r, catalog.index[r], column) for r in run_ids]
+    stats = run_tasks(_section_task, tasks, catalog.workers, progress)
+    return [ReportSection(f"Run {r}", stats=stats[r]) for r in run_ids]
+
+
+@instrument()
+def generate_pdf(output_path, stats, *figures, sections=(), dpi=150, workers=None, isolate=False):
+    """
+    Rapport WindLab : statistiques du run, puis toutes les figures, puis les
+    sections supplémentaires éventuelles (ex. campaign_sections).
+    """
+    main = ReportSection(None, stats=stats, figures=figures)
+    build_report(output_path, [main, *sections], dpi=dpi, workers=workers, isolate=isolate)
@@ -0,0 +1,102 @@
+import numpy as np
+
+from physics.wake_bastankhah import BastankhahWake
+from simulation.farm import farm_deficits
+
+HOURS_PER_YEAR = 8760
+
+
+class WindRose:
+    """
+    Rose des vents discrétisée : fréquences (m directions × s vitesses),
+    normalisées à 1. Directions météo en degrés (d'où vient le vent).
+    """
+
+    def __init__(self, directions, speeds, freq):
+        self.directions = np.asarray(directions, dtype=float)
+        self.speeds = np.asarray(speeds, dtype=float)
+        freq = np.asarray(freq, dtype=float).reshape(len(self.directions), len(self.speeds))
+        self.freq = freq / freq.sum()
+
+    @classmethod
+    def from_samples(cls, directions, speeds, n_directions=36, speed_step=1.0):
+        """Construit la rose à partir de séries (direction, vitesse) mesurées."""
+        width = 360 / n_directions
+        d = np.arange(n_directions) * width
+        d_idx = np.round(np.mod(directions, 360) / width).astype(int) % n_directions
+
+        speeds = np.asarray(speeds, dtype=float)
+        n_speeds = int(np.ceil(speeds.max() / speed_step)) + 1
+        s = np.arange(n_speeds) * speed_step
+        s_idx = np.clip(np.round(speeds / speed_step).astype(int), 0, n_speeds - 1)
+
+        counts = np.bincount(d_idx * n_speeds + s_idx, minlength=n_directions * n_speeds)
+        return cls(d, s, counts)
+
+    @classmethod
+    def uniform(cls, speed, n_directions=36):
+        """Rose uniforme en direction, vitesse unique."""
+        return cls(np.arange(n_directions) * 360 / n_directions, [speed], np.ones(n_directions))
+
+
+class PowerCurve:
+    """Courbe de puissance P(U) (kW) et coefficient de poussée Ct(U)."""
+
+    def __init__(self, speeds, power, ct=0.7):
+        self.speeds = np.asarray(speeds, dtype=float)
+        self.power = np.asarray(power, dtype=float)
+        self.ct = ct
+
+    @classmethod
+    def generic(cls, rated_power=2000.0, cut_in=3.0, rated_speed=12.0, cut_out=25.0, ct=0.7):
+        """Courbe cubique entre cut-in et vitesse nominale, plateau jusqu'au cut-out."""
+        speeds = np.linspace(0, cut_out, 251)
+        ramp = np.clip((speeds**3 - cut_in**3) / (rated_speed**3 - cut_in**3), 0, 1)
+        return cls(speeds, rated_power * ramp, ct)
+
+    def __call__(self, U):
+        return np.interp(U, self.speeds, self.power, left=0.0, right=0.0)
+
+    def thrust(self, U):
+        if np.ndim(self.ct) == 0:
+            return np.full(np.shape(U), float(self.ct))
+        return np.interp(U, self.speeds, self.ct)
+
+
+class AEPEvaluator:
+    """
+    Production annuelle (MWh/an) d'un parc sur toute une rose des vents.
+
+    Pour un parc donné, les coordonnées tournées et les distances entre
+    turbines ne sont calculées qu'une fois, pour toutes les directions ; les
+    classes de vitesse ne changent que l'amplitude du déficit (via Ct(U)) :
+        U_dsj = U_s * (1 - amplitude(Ct(U_s)) * G_dj)
+    où G_dj = sqrt(sum_i shape_ij**2) est la géométrie du sillage.
+    """
+
+    def __init__(self, rose, curve, model=None):
+        self.rose = rose
+        self.curve = curve
+        self.model = BastankhahWake() if model is None else model
+
+        # Précalculs indépendants du parc
+        self._amp = self.model.amplitude(curve.thrust(rose.speeds))       # (s,)
+        self._weights = rose.freq * HOURS_PER_YEAR / 1000                 # (m, s), kW -> MWh
+
+    def geometry(self, xs, ys):
+        """Géométrie G (..., m, n) du sillage pour chaque direction de la rose."""
+        return farm_deficits(xs, ys, self.rose.directions, self.model, Ct=None)
+
+    def turbine_aep(self, xs, ys):
+        """AEP par turbine, forme (..., n)."""
+        G = self.geometry(xs, ys)[..., :, None, :]                      # (..., m, 1, n)
+        U = self.rose.speeds[:, None] * (1 - self._amp[:, None] * G)    # (..., m, s, n)
+        return np.einsum("...dsn,ds->...n", self.curve(U), self._weights)
+
+    def aep(self, xs, ys):
+        """AEP totale du parc, forme (...)."""
+        return self.turbine_aep(xs, ys).sum(axis=-1)
+
+    def ideal_aep(self, n_turbines):
+        """AEP de n turbines sans aucun sillage."""
+        return n_turbines * np.sum(self._weights * self.curve(self.rose.speeds))
@@ -0,0 +1,164 @@
+import numpy as np
+
+from physics.turbulence import CrespoHernandez, wake_expansion
+from physics.wake_bastankhah import BastankhahWake
+
+
+def flow_vectors(directions):
+    """
+    Vecteur unitaire de l'écoulement pour des directions météo (degrés, d'où
+    vient le vent) : 270° = vent d'ouest, soufflant vers +x.
+    """
+    theta = np.deg2rad(np.asarray(directions, dtype=float))
+    return -np.sin(theta), -np.cos(theta)
+
+
+def pairwise_geometry(xs, ys, directions):
+    """
+    Distances aval et latérales entre turbines pour chaque direction.
+
+    xs, ys : positions (..., n) — les dimensions de tête (ex. population d'un
+    optimiseur) sont conservées.
+    Renvoie (down, cross) de forme (..., m, n, n) : pour la direction d,
+    down[..., d, i, j] est la distance aval de la turbine j derrière i.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    fx, fy = flow_vectors(np.atleast_1d(directions))
+
+    dx = (xs[..., None, :] - xs[..., :, None])[..., None, :, :]
+    dy = (ys[..., None, :] - ys[..., :, None])[..., None, :, :]
+    fx = fx[:, None, None]
+    fy = fy[:, None, None]
+
+    down = fx*dx + fy*dy
+    cross = fx*dy - fy*dx
+    return down, cross
+
+
+def _per_source(values, down):
+    """
+    Aligne une grandeur par turbine source (..., n), ou par direction et
+    turbine source (..., m, n), sur les paires (..., m, n, n).
+    """
+    if values is None or np.ndim(values) == 0:
+        return values
+    values = np.asarray(values, dtype=float)
+    if values.ndim == down.ndim - 1:
+        return values[..., None]
+    return values[..., None, :, None]
+
+
+def _gather(values, down, idx):
+    """Valeurs (scalaire ou alignées par `_per_source`) des paires `idx`."""
+    if np.ndim(values):
+        return np.broadcast_to(values, down.shape)[idx]
+    return values
+
+
+def _wake_pairs(down, cross, model, k):
+    """Paires (i, j) où j est en aval de i et dans son cône de sillage."""
+    k = _per_source(k, down)
+    idx = np.nonzero((down > 0) & (np.abs(cross) < model.radius(down, k)))
+    return idx, _gather(k, down, idx)
+
+
+def _sum_by_target(idx, values, out_shape):
+    """Somme de `values` (une par paire) par turbine cible : array out_shape."""
+    # Indice aplati (..., m, j)
+    target = np.ravel_multi_index(idx[:-2] + (idx[-1],), out_shape)
+    total = np.bincount(target, weights=values, minlength=int(np.prod(out_shape)))
+    return total.reshape(out_shape)
+
+
+def combine_deficits(down, cross, model, Ct=0.7, k=None):
+    """
+    Déficit de chaque turbine, superposition quadratique des sillages amont :
+        deficit_j = sqrt( sum_i deficit_ij**2 )
+
+    Seules les paires (i, j) où j est en aval de i ET dans le cône de sillage
+    de i sont évaluées ; le reste de la matrice n'est jamais calculé.
+    Ct et k peuvent être scalaires ou donnés par turbine source, (..., n) ou
+    (..., m, n) ; avec Ct=None, l'amplitude vaut 1 (géométrie seule :
+    sqrt(sum shape**2)). Renvoie un array (..., m, n).
+    """
+    idx, k = _wake_pairs(down, cross, model, k)
+
+    amp = 1.0 if Ct is None else _gather(_per_source(model.amplitude(Ct), down), down, idx)
+    d2 = (amp * model.shape(down[idx], cross[idx], k))**2
+    return np.sqrt(_sum_by_target(idx, d2, down.shape[:-1]))
+
+
+def combine_turbulence(down, cross, model, I0, added=None, Ct=0.7, k=None):
+    """
+    TI locale de chaque turbine, superposition quadratique des turbulences
+    ajoutées par les sillages amont :
+        TI_j = sqrt( I0**2 + sum_i dI_ij**2 )
+
+    Mêmes paires que `combine_deficits` (aval et dans le cône de sillage,
+    avec le taux k, par défaut celui de la TI ambiante). `added` est un
+    modèle de physics.turbulence (Crespo-Hernández par défaut).
+    Renvoie un array (..., m, n).
+    """
+    if added is None:
+        added = CrespoHernandez(model.D)
+    if k is None:
+        k = wake_expansion(I0)
+
+    idx, _ = _wake_pairs(down, cross, model, k)
+    ct = _gather(_per_source(Ct, down), down, idx)
+    dI = added.added(ct, down[idx], I0)
+    return np.sqrt(I0**2 + _sum_by_target(idx, dI**2, down.shape[:-1]))
+
+
+def local_wake_expansion(down, cross, model, I0, added=None, Ct=0.7):
+    """
+    Taux d'expansion k (..., m, n) de chaque sillage, à partir de la TI
+    locale de la turbine qui l'émet (une passe : les turbulences ajoutées
+    sont évaluées avec les cônes de la TI ambiante).
+    """
+    if Ct is None:
+        return wake_expansion(I0)
+    return wake_expansion(combine_turbulence(down, cross, model, I0, added, Ct))
+
+
+def farm_turbulence(xs, ys, I0, directions=270, model=None, added=None, Ct=0.7, k=None):
+    """TI locale (..., m, n) de chaque turbine pour chaque direction."""
+    if model is None:
+        model = BastankhahWake()
+    down, cross = pairwise_geometry(xs, ys, directions)
+    return combine_turbulence(down, cross, model, I0, added, Ct, k)
+
+
+def farm_deficits(xs, ys, directions=270, model=None, Ct=0.7, k=None, I0=None, added=None):
+    """
+    Déficit combiné (..., m, n) de chaque turbine pour chaque direction.
+
+    Avec une TI ambiante `I0` (et k=None), le taux d'expansion de chaque
+    sillage suit la TI locale de sa turbine (`local_wake_expansion`).
+    """
+    if model is None:
+        model = BastankhahWake()
+    down, cross = pairwise_geometry(xs, ys, directions)
+    if I0 is not None and k is None:
+        k = local_wake_expansion(down, cross, model, I0, added, Ct)
+    return combine_deficits(down, cross, model, Ct=Ct, k=k)
+
+
+def farm_velocities(xs, ys, U0, directions=270, model=None, Ct=0.7, k=None, I0=None, added=None):
+    """Vitesse vue par chaque turbine : U0 * (1 - deficit), forme (..., m, n)."""
+    deficit = farm_deficits(xs, ys, directions, model, Ct, k, I0, added)
+    return np.asarray(U0, dtype=float) * (1 - deficit)
+
+
+def farm_power(xs, ys, U0, directions=270, weights=None, model=None, Ct=0.7, k=None,
+               I0=None, added=None):
+    """
+    Production du parc (somme des U**3), moyennée sur les directions avec les
+    poids `weights` (uniformes par défaut). Renvoie un array de forme (...).
+    """
+    U = farm_velocities(xs, ys, U0, directions, model, Ct, k, I0, added)
+    P = np.sum(U**3, axis=-1)
+    m = P.shape[-1]
+    w = np.full(m, 1 / m) if weights is None else np.asarray(weights, dtype=float)
+    return P @ w
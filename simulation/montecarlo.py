@@ -1,22 +1,226 @@
 import numpy as np
-from physics.wake_bastankhah import bastankhah
+from concurrent.futures import ProcessPoolExecutor
+from physics.wake_bastankhah import BastankhahWake
 
-def mc_from_signals(P1, P2, N=1000):
+from utils.math_tools import RunningStats
+from utils.profiling import instrument
+
+
+def signal_params(P1, P2):
+    """Paramètres du tirage : moyennes de P1, P2 et écart-type de P2 - P1."""
+    n = min(len(P1), len(P2))
+    return np.mean(P1), np.mean(P2), np.sqrt(np.var(P2[:n] - P1[:n]))
+
+
+def draw_power(rng, U1_mean, U2_mean, sigma, n):
+    """Tire n scénarios de puissance totale U1**3 + U2**3 (vectorisé)."""
+    U = rng.normal(0.0, sigma, size=(2, n))
+    U[0] += U1_mean
+    U[1] += U2_mean
+    return U[0]**3 + U[1]**3
+
+
+@instrument()
+def mc_from_signals(P1, P2, N=1000, seed=None):
     """
     Monte-Carlo basé sur les signaux mesurés :
     - P1 = série temporelle éolienne 1
     - P2 = série temporelle éolienne 2
+
+    Les N tirages sont faits en un seul appel au générateur ; `seed`
+    (int, SeedSequence ou Generator) rend le résultat reproductible.
+    """
+    rng = np.random.default_rng(seed)
+    return draw_power(rng, *signal_params(P1, P2), N)
+
+
+# ---------- Monte-Carlo par blocs ----------
+def _power_edges(U1_mean, U2_mean, sigma, bins, width=8.0):
+    """Bornes de l'histogramme de Ptot : ±`width` écarts-types sur U1 et U2."""
+    lo = (U1_mean - width*sigma)**3 + (U2_mean - width*sigma)**3
+    hi = (U1_mean + width*sigma)**3 + (U2_mean + width*sigma)**3
+    if hi <= lo:
+        hi = lo + 1.0
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _mc_chunk(args):
+    params, n, seed_seq, edges = args
+    rng = np.random.default_rng(seed_seq)
+    P = draw_power(rng, *params, n)
+
+    stats = RunningStats().update(P)
+    idx = np.clip(np.searchsorted(edges, P, side="right") - 1, 0, len(edges) - 2)
+    hist = np.bincount(idx, minlength=len(edges) - 1)
+    return stats, hist
+
+
+def _hist_quantiles(edges, hist, quantiles):
+    cdf = np.concatenate(([0], np.cumsum(hist))) / max(hist.sum(), 1)
+    return {q: float(np.interp(q, cdf, edges)) for q in quantiles}
+
+
+def iter_mc_summary(P1, P2, N=10_000_000, chunk_size=1_000_000, seed=None,
+                    workers=1, quantiles=(0.05, 0.5, 0.95), bins=8192):
+    """
+    Monte-Carlo par blocs : génère un résumé après chaque bloc de `chunk_size`
+    tirages ({"count", "mean", "std", "quantiles"}).
+
+    - chaque bloc a son propre flux aléatoire (SeedSequence(seed).spawn), donc
+      le résultat ne dépend que de `seed` et `chunk_size`, pas de `workers`
+    - les quantiles sont lus sur un histogramme fixe (±8σ sur U1 et U2),
+      fusionnable d'un bloc à l'autre : la mémoire ne dépend pas de N
+    - `workers` > 1 répartit les blocs sur un pool de processus
+
+    N et chunk_size doivent être > 0 (ValueError sinon).
     """
-    U1_mean = np.mean(P1)
-    U2_mean = np.mean(P2)
-    var = np.var(P2 - P1)
+    if N <= 0 or chunk_size <= 0:
+        raise ValueError(f"N et chunk_size doivent être > 0 (N={N}, chunk_size={chunk_size})")
+    params = signal_params(P1, P2)
+    edges = _power_edges(*params, bins)
 
-    results = []
-    for _ in range(N):
-        U1 = np.random.normal(U1_mean, np.sqrt(var))
-        U2 = np.random.normal(U2_mean, np.sqrt(var))
+    sizes = [chunk_size] * (N // chunk_size)
+    if N % chunk_size:
+        sizes.append(N % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(params, n, s, edges) for n, s in zip(sizes, seeds)]
 
-        Ptot = U1**3 + U2**3
-        results.append(Ptot)
+    stats = RunningStats()
+    hist = np.zeros(bins, dtype=np.int64)
+
+    def summary():
+        return {
+            "count": stats.count,
+            "mean": stats.mean,
+            "std": stats.std(ddof=1),
+            "quantiles": _hist_quantiles(edges, hist, quantiles),
+        }
+
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_stats, chunk_hist in pool.map(_mc_chunk, tasks):
+                stats.merge(chunk_stats)
+                hist += chunk_hist
+                yield summary()
+    else:
+        for task in tasks:
+            chunk_stats, chunk_hist = _mc_chunk(task)
+            stats.merge(chunk_stats)
+            hist += chunk_hist
+            yield summary()
+
+
+@instrument()
+def mc_summary(P1, P2, N=10_000_000, chunk_size=1_000_000, seed=None,
+               workers=1, quantiles=(0.05, 0.5, 0.95), progress=None):
+    """
+    Résumé final de `iter_mc_summary` ; `progress(done, total)` est appelé
+    après chaque bloc avec le nombre de tirages effectués.
+    """
+    for result in iter_mc_summary(P1, P2, N=N, chunk_size=chunk_size, seed=seed,
+                                  workers=workers, quantiles=quantiles):
+        if progress is not None:
+            progress(result["count"], N)
+    return result
 
-    return np.array(results)
\ No newline at end of file
+
+# ---------- Balayage d'espacement (modèle de sillage) ----------
+SAMPLERS = ("sobol", "lhs", "random")
+
+
+def _uniform_samples(method, n, dim, rng):
+    """n points uniformes dans [0, 1)^dim (Sobol brouillé, hypercube latin ou pseudo-aléatoire)."""
+    if method == "random":
+        return rng.random((n, dim))
+
+    from scipy.stats import qmc
+    if method == "sobol":
+        # Sobol : puissance de 2 points pour garder l'équirépartition
+        return qmc.Sobol(dim, scramble=True, seed=rng).random_base2(int(np.ceil(np.log2(n))))
+    if method == "lhs":
+        return qmc.LatinHypercube(dim, seed=rng).random(n)
+    raise ValueError(f"Échantillonnage inconnu : {method!r} (choix : {', '.join(SAMPLERS)})")
+
+
+def _normal_scenarios(method, n, dim, rng, antithetic):
+    """Scénarios gaussiens centrés réduits (n, dim) ; avec `antithetic`, z et -z."""
+    from scipy.special import ndtri
+
+    u = _uniform_samples(method, n // 2 if antithetic else n, dim, rng)
+    z = ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+    return np.concatenate([z, -z]) if antithetic else z
+
+
+def _sweep_replicate(x, z, U0, sigma, lateral, model, Ct, block_size):
+    """
+    Puissance moyenne U1**3 + U2**3 pour chaque distance x, sur les mêmes
+    scénarios z pour toutes les distances (nombres aléatoires communs).
+    La matrice distances x scénarios est évaluée par blocs de scénarios.
+    """
+    total = np.zeros(len(x))
+    step = max(1, block_size // len(x))
+    for start in range(0, len(z), step):
+        zb = z[start:start + step]
+        U1 = np.maximum(U0 + sigma * zb[:, 0], 0.0)
+        r = lateral * zb[:, 1] if zb.shape[1] > 1 else 0.0
+        U2 = model.velocity(U1, Ct, x[:, None], r)
+        total += np.sum(U1**3 + U2**3, axis=1)
+    return total / len(z)
+
+
+@instrument()
+def spacing_sweep(U0, sigma, distances=np.arange(2, 16), model=None, D=100, Ct=0.7,
+                  lateral_std=0.0, n_samples=1024, replicates=16, method="sobol",
+                  antithetic=True, confidence=0.95, seed=None, block_size=2**20):
+    """
+    Production moyenne de deux turbines alignées (U1**3 + U2**3) en fonction
+    de leur espacement, avec le modèle de sillage `model` (Bastankhah par
+    défaut ; ex. JensenWake(D)).
+
+    - U1 ~ N(U0, sigma) ; avec `lateral_std` (en D), décalage latéral
+      aléatoire de la turbine aval (méandrement du sillage)
+    - `distances` en diamètres de rotor
+    - échantillonnage quasi-aléatoire (`method` : "sobol", "lhs", "random"),
+      variables antithétiques et mêmes scénarios pour toutes les distances :
+      les écarts entre distances ne sont pas noyés dans le bruit de tirage
+    - `replicates` répétitions indépendantes (brouillage / graine) : la bande
+      de confiance est l'intervalle de Student sur leurs moyennes
+    - `n_samples` >= 2 tirages par répétition (ValueError sinon) ; avec
+      Sobol il est arrondi à la puissance de 2 supérieure (équirépartition),
+      avec `antithetic` au nombre pair inférieur (ex. 1000 -> 1024 en Sobol)
+
+    Renvoie (results, bands) : {distance: puissance moyenne} pour
+    `plot_montecarlo_results`, et {distance: (bas, haut)}.
+    """
+    from scipy.stats import t as student
+
+    if n_samples < 2:
+        raise ValueError(f"n_samples doit être >= 2 (reçu {n_samples})")
+    if model is None:
+        model = BastankhahWake(D)
+    distances = np.asarray(distances, dtype=float)
+    x = distances * model.D
+    dim = 2 if lateral_std > 0 else 1
+
+    means = np.empty((replicates, len(distances)))
+    for i, seq in enumerate(np.random.SeedSequence(seed).spawn(replicates)):
+        z = _normal_scenarios(method, n_samples, dim, np.random.default_rng(seq), antithetic)
+        means[i] = _sweep_replicate(x, z, U0, sigma, lateral_std * model.D, model, Ct, block_size)
+
+    mean = means.mean(axis=0)
+    if replicates > 1:
+        half = student.ppf(0.5 + confidence / 2, replicates - 1) * means.std(axis=0, ddof=1) / np.sqrt(replicates)
+    else:
+        half = np.full(len(distances), np.nan)
+
+    results = {float(d): float(m) for d, m in zip(distances, mean)}
+    bands = {float(d): (float(m - h), float(m + h)) for d, m, h in zip(distances, mean, half)}
+    return results, bands
+
+
+def spacing_sweep_from_signals(P1, **kwargs):
+    """
+    `spacing_sweep` avec U0 = moyenne et sigma = écart-type de la vitesse
+    amont mesurée P1 (la turbine aval est simulée par le modèle de sillage).
+    """
+    return spacing_sweep(np.mean(P1), np.std(P1), **kwargs)
@@ -1,6 +1,17 @@
 import numpy as np
 from physics.wake_bastankhah import bastankhah
 
+from utils.profiling import instrument
+
+# Population par défaut de l'évolution différentielle : 10 par turbine, mais
+# au plus MAX_POP_SIZE et assez petite pour MIN_GENERATIONS générations
+MAX_POP_SIZE = 200
+MIN_GENERATIONS = 20
+
+# Mémoire visée pour une évaluation de la population (tableaux (P, m, n, n))
+COST_CHUNK_BYTES = 256 * 2**20
+
+
 def score_two_turbines(x1, y1, x2, y2, U0, variance, D=100, Ct=0.7, k=0.05):
     """
     Score = production moyenne des deux turbines.
@@ -16,21 +27,202 @@ def score_two_turbines(x1, y1, x2, y2, U0, variance, D=100, Ct=0.7, k=0.05):
     return (U1**3) + (U2**3)
 
 
-def optimize_two_turbines(U0, variance, iterations=5000, terrain_size=2000, D=100):
-    best_score = -np.inf
-    best_positions = None
+@instrument()
+def optimize_two_turbines(U0, variance, iterations=5000, terrain_size=2000, D=100, seed=None, progress=None):
+    """
+    Positions optimales de deux turbines (vent de la gauche vers la droite),
+    avec un budget de `iterations` évaluations : voir `optimize_layout`.
+    """
+    score, pos = optimize_layout(2, U0, variance, terrain_size=terrain_size, D=D,
+                                 max_evals=iterations, seed=seed, progress=progress)
+    (x1, y1), (x2, y2) = pos
+    return score, ((x1, y1), (x2, y2))
+
+
+# ---------- Optimisation de parc (N turbines) ----------
+def pair_indices(n):
+    return np.triu_indices(n, k=1)
+
+
+def spacing_margin(xs, ys, min_dist):
+    """
+    Contrainte d'espacement analytique : d_ij**2 - min_dist**2 pour chaque
+    paire i < j (>= 0 si respectée). Forme (..., n(n-1)/2).
+    """
+    i, j = pair_indices(np.shape(xs)[-1])
+    dx = xs[..., j] - xs[..., i]
+    dy = ys[..., j] - ys[..., i]
+    return dx**2 + dy**2 - min_dist**2
+
+
+def spacing_margin_jac(xs, ys):
+    """Jacobien de `spacing_margin` par rapport à (x_1..x_n, y_1..y_n)."""
+    n = len(xs)
+    i, j = pair_indices(n)
+    rows = np.arange(len(i))
+    dx = xs[j] - xs[i]
+    dy = ys[j] - ys[i]
+
+    jac = np.zeros((len(i), 2*n))
+    jac[rows, i] = -2*dx
+    jac[rows, j] = 2*dx
+    jac[rows, n + i] = -2*dy
+    jac[rows, n + j] = 2*dy
+    return jac
+
+
+def common_speed_moment(U0, variance, n_samples=256, seed=None):
+    """
+    Nombres aléatoires communs : un seul jeu de vitesses amont U ~ N(U0, var)
+    partagé par tous les candidats.
+
+    Les déficits ne dépendant pas de U (Ct fixé), la production moyenne vaut
+    E[U**3] * sum_j (1 - deficit_j)**3 : seul le moment E[U**3] du jeu commun
+    est nécessaire, et deux candidats sont comparés sans bruit.
+    """
+    rng = np.random.default_rng(seed)
+    U = rng.normal(U0, np.sqrt(variance), n_samples)
+    return np.mean(U**3)
+
+
+def differential_evolution(cost, lower, upper, pop_size=40, generations=100,
+                           F=(0.5, 1.0), CR=0.9, seed=None, progress=None):
+    """
+    Évolution différentielle (rand/1/bin) entièrement vectorisée.
+
+    cost : fonction (P, dim) -> (P,) à minimiser, appelée une fois par génération
+    pour toute la population, soit pop_size * (generations + 1) évaluations.
+    pop_size >= 4 (trois parents distincts de l'individu courant).
+    `progress(done, total)` reçoit le nombre d'évaluations.
+    Renvoie (meilleur vecteur, coût).
+    """
+    if pop_size < 4:
+        raise ValueError(f"pop_size doit être >= 4 (reçu {pop_size})")
+    rng = np.random.default_rng(seed)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    dim = len(lower)
+
+    pop = lower + rng.random((pop_size, dim)) * (upper - lower)
+    fit = cost(pop)
+    total = pop_size * (generations + 1)
+
+    for g in range(generations):
+        if progress is not None:
+            progress(pop_size * (g + 1), total)
+
+        # Trois parents distincts et différents de l'individu courant
+        keys = rng.random((pop_size, pop_size))
+        np.fill_diagonal(keys, np.inf)
+        r = np.argpartition(keys, 3, axis=1)[:, :3]
+
+        f = rng.uniform(F[0], F[1], (pop_size, 1))
+        mutant = pop[r[:, 0]] + f * (pop[r[:, 1]] - pop[r[:, 2]])
+
+        cross = rng.random((pop_size, dim)) < CR
+        cross[np.arange(pop_size), rng.integers(0, dim, pop_size)] = True
+        trial = np.clip(np.where(cross, mutant, pop), lower, upper)
+
+        trial_fit = cost(trial)
+        better = trial_fit <= fit
+        pop[better] = trial[better]
+        fit[better] = trial_fit[better]
+
+    if progress is not None:
+        progress(total, total)
+
+    best = np.argmin(fit)
+    return pop[best], fit[best]
+
+
+@instrument()
+def optimize_layout(n_turbines, U0, variance, terrain_size=2000, D=100, directions=270,
+                    weights=None, model=None, Ct=0.7, max_evals=5000, pop_size=None,
+                    n_samples=256, refine=True, seed=None, progress=None, aep=None, I0=None,
+                    chunk_bytes=COST_CHUNK_BYTES):
+    """
+    Placement de `n_turbines` dans un terrain carré, maximisant la production
+    moyenne sous la contrainte d'espacement d_ij >= 2D.
+
+    Par défaut la production est sum U**3 sous les directions `directions` ;
+    avec `aep` (un AEPEvaluator), l'objectif devient la production annuelle
+    sur la rose des vents, et le score est renvoyé en MWh/an.
+    Avec une TI ambiante `I0`, l'expansion de chaque sillage suit la TI
+    locale de sa turbine (turbulence ajoutée recalculée à chaque évaluation).
+
+    1) évolution différentielle vectorisée (une évaluation de parc par
+       génération), au plus `max_evals` (>= 4) évaluations de parc,
+       contrainte traitée par pénalité ; la population est
+       évaluée par blocs d'environ `chunk_bytes` de temporaires
+    2) raffinement SLSQP optionnel avec la contrainte d'espacement et son
+       jacobien analytiques
+
+    Renvoie (score, positions) avec positions de forme (n_turbines, 2).
+    """
+    from simulation.farm import farm_power
+
+    min_dist = 2*D
+    n = n_turbines
+
+    if aep is None:
+        ideal = common_speed_moment(U0, variance, n_samples, seed) * n
+
+        def production(xs, ys):
+            return farm_power(xs, ys, 1.0, directions, weights, model, Ct, I0=I0) / n
+    else:
+        ideal = aep.ideal_aep(n)
+
+        def production(xs, ys):
+            return aep.aep(xs, ys) / ideal
+
+    def efficiency(v):
+        # Production normalisée par celle de n turbines sans sillage
+        v = np.asarray(v)
+        return production(v[..., :n], v[..., n:])
+
+    # Octets par candidat : ~8 tableaux float64 (m, n, n) pour la géométrie
+    # des sillages, et (m, s, n) pour les classes de vitesse de la rose
+    if aep is None:
+        m, s = np.size(directions), 0
+    else:
+        m, s = len(aep.rose.directions), len(aep.rose.speeds)
+    chunk = max(1, int(chunk_bytes // (8 * 8 * m * n * (n + s))))
+
+    def cost(pop):
+        violation = np.maximum(0, -spacing_margin(pop[:, :n], pop[:, n:], min_dist))
+        eff = np.concatenate([efficiency(pop[i:i + chunk]) for i in range(0, len(pop), chunk)])
+        return -eff + 10 * violation.sum(axis=-1) / min_dist**2
+
+    if max_evals < 4:
+        raise ValueError(f"max_evals doit être >= 4 (reçu {max_evals})")
+    if pop_size is None:
+        pop_size = max(20, min(10*n, MAX_POP_SIZE, max_evals // MIN_GENERATIONS))
+        pop_size = min(pop_size, max(4, max_evals // 2))  # Petit budget : au moins une génération
+    pop_size = min(pop_size, max_evals)
+    generations = max(0, max_evals // pop_size - 1)
 
-    for _ in range(iterations):
-        x1, y1 = np.random.uniform(0, terrain_size, 2)
-        x2, y2 = np.random.uniform(0, terrain_size, 2)
+    lower = np.zeros(2*n)
+    upper = np.full(2*n, float(terrain_size))
+    best, _ = differential_evolution(cost, lower, upper, pop_size, generations,
+                                     seed=seed, progress=progress)
 
-        # contrainte : espacement > 2D
-        if np.sqrt((x2-x1)**2 + (y2-y1)**2) < 2*D:
-            continue
+    if refine and n > 1:
+        from scipy.optimize import minimize
 
-        score = score_two_turbines(x1, y1, x2, y2, U0, variance, D=D)
-        if score > best_score:
-            best_score = score
-            best_positions = ((x1, y1), (x2, y2))
+        res = minimize(
+            lambda v: -efficiency(v),
+            best,
+            method="SLSQP",
+            bounds=list(zip(lower, upper)),
+            constraints={
+                "type": "ineq",
+                "fun": lambda v: spacing_margin(v[:n], v[n:], min_dist) / min_dist**2,
+                "jac": lambda v: spacing_margin_jac(v[:n], v[n:]) / min_dist**2,
+            },
+        )
+        feasible = np.all(spacing_margin(res.x[:n], res.x[n:], min_dist) >= -1e-6)
+        if feasible and efficiency(res.x) >= efficiency(best):
+            best = res.x
 
-    return best_score, best_positions
\ No newline at end of file
+    score = ideal * efficiency(best)
+    return score, np.column_stack([best[:n], best[n:]])
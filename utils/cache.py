@@ -0,0 +1,267 @@
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes, np.generic, np.dtype)
+
+
+def _pandas_parts(obj):
+    """Éléments à hacher pour un objet pandas (Index, Series, DataFrame), sinon None."""
+    pd = sys.modules.get("pandas")  # Pas d'objet pandas possible si pandas n'est pas importé
+    if pd is None:
+        return None
+    if isinstance(obj, pd.Index):
+        return ("Index", str(obj.dtype), obj.to_numpy())
+    if isinstance(obj, pd.Series):
+        return ("Series", obj.name, str(obj.dtype), obj.index, obj.to_numpy())
+    if isinstance(obj, pd.DataFrame):
+        return ("DataFrame", obj.columns, obj.index, [obj[c].to_numpy() for c in obj.columns])
+    return None
+
+
+def hash_key(*parts):
+    """
+    Empreinte (hex) d'un ensemble de paramètres : les arrays numpy (et les
+    objets pandas) sont hachés sur leur contenu (dtype, forme, octets), les
+    scalaires sur leur repr, les dicts / listes / tuples récursivement.
+
+    Un type inconnu lève TypeError : sa repr (tronquée, ou sans le contenu)
+    ne suffit pas à distinguer deux valeurs.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(f"ndarray{part.dtype.str}{part.shape}".encode())
+            if part.dtype.hasobject:
+                h.update(hash_key(*part.ravel().tolist()).encode())
+            else:
+                h.update(memoryview(np.ascontiguousarray(part)).cast("B"))
+        elif isinstance(part, dict):
+            h.update(b"dict")
+            for k in sorted(part):
+                h.update(hash_key(k, part[k]).encode())
+        elif isinstance(part, (list, tuple)):
+            h.update(f"{type(part).__name__}{len(part)}".encode())
+            for p in part:
+                h.update(hash_key(p).encode())
+        elif isinstance(part, SCALAR_TYPES):
+            h.update(f"{type(part).__name__}:{part!r}".encode())
+        else:
+            pandas_parts = _pandas_parts(part)
+            if pandas_parts is None:
+                raise TypeError(f"hash_key : type non pris en charge {type(part).__name__}")
+            h.update(hash_key(*pandas_parts).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def temp_path(path):
+    """
+    Fichier temporaire propre à l'écrivain (processus et thread) pour une
+    écriture atomique de `path` par os.replace.
+    """
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+class DiskCache:
+    """
+    Cache disque adressé par contenu : une entrée = un fichier <clé>.npz
+    contenant un dict d'arrays (ou <clé>.pkl pour un objet quelconque).
+    Écriture atomique, lecture sans verrou.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        try:
+            with np.load(self.path(key)) as data:
+                return {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, arrays):
+        path = self.path(key)
+        tmp = temp_path(path)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+        except OSError:
+            return None
+        return path
+
+    def get_object(self, key):
+        """Renvoie (trouvé, objet) pour une entrée écrite par `set_object`."""
+        try:
+            with open(os.path.join(self.directory, f"{key}.pkl"), "rb") as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+    def set_object(self, key, obj):
+        path = os.path.join(self.directory, f"{key}.pkl")
+        tmp = temp_path(path)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            return None
+        return path
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+
+def nbytes(obj):
+    """Taille approximative (octets) d'un résultat : arrays, tuples, dicts."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def _arrays(obj):
+    """Arrays numpy contenus dans des arguments (dicts, listes, tuples)."""
+    if isinstance(obj, np.ndarray):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _arrays(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from _arrays(v)
+
+
+def _freeze(obj, inputs=()):
+    """
+    Passe les arrays d'un résultat en lecture seule (ils sont partagés).
+
+    Un array qui partage sa mémoire avec une entrée (`inputs`, ex. renvoyée
+    telle quelle ou en vue) est copié d'abord : l'appelant garde la main sur
+    ses propres arrays.
+    """
+    if isinstance(obj, np.ndarray):
+        if any(np.may_share_memory(obj, a) for a in inputs):
+            obj = obj.copy()
+        obj.flags.writeable = False
+        return obj
+    if isinstance(obj, dict):
+        return type(obj)((k, _freeze(v, inputs)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [_freeze(v, inputs) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_freeze(v, inputs) for v in obj)
+    return obj
+
+
+class Memo:
+    """
+    Mémoïsation des calculs de prétraitement et de simulation.
+
+    La clé est l'empreinte du contenu des arrays d'entrée et des paramètres
+    (`hash_key`), pas l'identité des objets : re-sélectionner un run ou
+    relancer un filtrage avec les mêmes fmin/fmax retrouve le résultat.
+
+    - niveau mémoire : LRU borné par un budget en octets (`max_bytes`)
+    - niveau disque optionnel (`disk_dir`) : résultats picklés, partagés
+      entre sessions
+
+    Les arrays renvoyés sont en lecture seule. Les arguments nommés listés
+    dans IGNORED_KWARGS (callbacks de progression) n'entrent pas dans la clé.
+    """
+
+    IGNORED_KWARGS = ("progress",)
+
+    def __init__(self, max_bytes=512 * 2**20, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk = DiskCache(disk_dir) if disk_dir else None
+        self._lru = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, fn, args, kwargs):
+        params = {k: v for k, v in kwargs.items() if k not in self.IGNORED_KWARGS}
+        return hash_key(fn.__module__, fn.__qualname__, args, params)
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return True, self._lru[key][0]
+        if self.disk is not None:
+            found, value = self.disk.get_object(key)
+            if found:
+                value = _freeze(value)
+                self._put(key, value)
+                return True, value
+        return False, None
+
+    def _put(self, key, value):
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._lru:
+                self._bytes -= self._lru.pop(key)[1]
+            self._lru[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old) = self._lru.popitem(last=False)
+                self._bytes -= old
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs), ou son résultat mémorisé."""
+        key = self.key(fn, args, kwargs)
+        found, value = self._get(key)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if found:
+            return value
+
+        inputs = list(_arrays((args, kwargs)))
+        value = _freeze(fn(*args, **kwargs), inputs)
+        self._put(key, value)
+        if self.disk is not None:
+            self.disk.set_object(key, value)
+        return value
+
+    def memoize(self, fn):
+        """Décorateur : `cached = memo.memoize(fft_filter)`."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._lru)
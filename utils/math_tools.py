@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class RunningStats:
+    """
+    Moyenne / variance en une seule passe (Welford, fusion par blocs de Chan).
+
+    On alimente l'objet bloc par bloc avec `update(block)` ; deux accumulateurs
+    calculés séparément (ex. dans deux processus) se combinent avec `merge`.
+    La mémoire utilisée ne dépend pas du nombre d'échantillons.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, block):
+        block = np.asarray(block, dtype=float).ravel()
+        n = block.size
+        if n == 0:
+            return self
+
+        mean = block.mean()
+        m2 = np.sum((block - mean)**2)
+        return self._combine(n, mean, m2)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        return self._combine(other.count, other.mean, other.m2)
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        return self
+
+    def variance(self, ddof=0):
+        if self.count - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
@@ -1,16 +1,138 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+
+# ---------- Décimation ----------
+def minmax_decimate(x, y, n_bins):
+    """
+    Enveloppe min/max : découpe (x, y) en n_bins classes et garde, dans
+    l'ordre, le min et le max de chacune (au plus 2 * n_bins points).
+    Les pics restent visibles, contrairement à un simple sous-échantillonnage.
+    """
+    n = len(y)
+    if n <= 2 * n_bins:
+        return x, y
+
+    w = -(-n // n_bins)
+    pad = n_bins * w - n
+    yy = np.pad(y, (0, pad), mode="edge").reshape(n_bins, w)
+
+    offsets = np.arange(n_bins)[:, None] * w
+    pair = np.sort(np.stack([yy.argmin(axis=1), yy.argmax(axis=1)], axis=1), axis=1)
+    idx = np.minimum((offsets + pair).ravel(), n - 1)
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets : garde n_out points qui préservent la
+    forme visuelle de la courbe (premier et dernier points inclus).
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Point moyen de la classe suivante (ou dernier point)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return x[idx], y[idx]
+
+
+DECIMATORS = {"minmax": lambda x, y, n: minmax_decimate(x, y, n // 2), "lttb": lttb}
+
+
+class DecimatedLine:
+    """
+    Courbe matplotlib qui n'affiche que ~1 à 2 points par pixel.
+
+    Les données pleine résolution sont gardées ; à chaque changement de
+    l'axe x (zoom, déplacement, autoscale), la portion visible est
+    re-décimée depuis ces données : le rendu reste exact à l'écran.
+    """
+
+    def __init__(self, ax, y, x=None, method="minmax", **kwargs):
+        self.ax = ax
+        self.method = method
+        self.line, = ax.plot([], [], **kwargs)
+        self.line.decimator = self
+        self.set_full_data(y, x)
+        ax.callbacks.connect("xlim_changed", lambda ax: self.redraw())
+
+    def __getstate__(self):
+        # Une figure picklée (ex. rendu PDF en parallèle) n'emporte que les
+        # points affichés, pas les données pleine résolution
+        state = dict(self.__dict__)
+        state["x"], state["y"] = self.line.get_data()
+        return state
+
+    def set_full_data(self, y, x=None):
+        self.y = np.asarray(y)
+        self.x = np.arange(len(self.y)) if x is None else np.asarray(x)
+        self.redraw(full=True)
+
+    def n_points(self):
+        width = self.ax.get_window_extent().width
+        return max(int(2 * width), 1000)
+
+    def redraw(self, full=False):
+        if full or len(self.x) == 0:
+            i0, i1 = 0, len(self.x)
+        else:
+            lo, hi = sorted(self.ax.get_xlim())
+            i0 = max(np.searchsorted(self.x, lo) - 1, 0)
+            i1 = min(np.searchsorted(self.x, hi) + 1, len(self.x))
+
+        x, y = DECIMATORS[self.method](self.x[i0:i1], self.y[i0:i1], self.n_points())
+        self.line.set_data(x, y)
+
+    def full_extent(self):
+        """Données pleine résolution, pour l'autoscale (xmin, xmax, ymin, ymax)."""
+        if len(self.y) == 0:
+            return None
+        return self.x[0], self.x[-1], np.nanmin(self.y), np.nanmax(self.y)
+
+
+def autoscale_decimated(ax, lines, margin=0.05):
+    """Cale les axes sur l'étendue pleine résolution des courbes décimées."""
+    extents = [e for e in (d.full_extent() for d in lines) if e is not None]
+    if not extents:
+        return
+    x0 = min(e[0] for e in extents)
+    x1 = max(e[1] for e in extents)
+    y0 = min(e[2] for e in extents)
+    y1 = max(e[3] for e in extents)
+    dy = (y1 - y0) * margin or 1.0
+    ax.set_ylim(y0 - dy, y1 + dy)
+    ax.set_xlim(x0, x1 if x1 > x0 else x0 + 1)
+
+
 def plot_signal(original, filtered=None, title="Signal"):
     """
     Trace un signal brut et, optionnellement, sa version filtrée.
     original : array-like
     filtered : array-like ou None
+
+    Les courbes sont décimées (enveloppe min/max) à la résolution de l'écran
+    et re-décimées au zoom : seuls quelques milliers de points sont tracés.
     """
     plt.figure(figsize=(8, 4))
-    plt.plot(original, label="Original", alpha=0.6)
+    ax = plt.gca()
+    lines = [DecimatedLine(ax, original, label="Original", alpha=0.6)]
     if filtered is not None:
-        plt.plot(filtered, label="Filtré", linewidth=2)
+        lines.append(DecimatedLine(ax, filtered, label="Filtré", linewidth=2))
+    autoscale_decimated(ax, lines)
     plt.legend()
     plt.title(title)
     plt.xlabel("Indice")
@@ -19,14 +141,46 @@ def plot_signal(original, filtered=None, title="Signal"):
     return plt.gcf()
 
 
-def plot_fft(freqs, spectrum):
+def update_signal(fig, original, filtered=None, title=None):
+    """
+    Met à jour en place une figure créée par `plot_signal` (set_data), sans
+    recréer de figure. Renvoie False si la figure n'a pas la même structure.
+    """
+    axes = fig.get_axes()
+    if len(axes) != 1:
+        return False
+    ax = axes[0]
+    lines = ax.get_lines()
+    new = [original] if filtered is None else [original, filtered]
+    if len(lines) != len(new):
+        return False
+
+    decimated = [getattr(line, "decimator", None) for line in lines]
+    if None in decimated:
+        return False
+
+    for d, y in zip(decimated, new):
+        d.set_full_data(y)
+    if title is not None:
+        ax.set_title(title)
+    autoscale_decimated(ax, decimated)
+    return True
+
+
+def plot_fft(freqs, spectrum, mean=None):
     """
     Trace le module du spectre de Fourier.
     freqs : fréquences (Hz)
-    spectrum : valeurs complexes de la FFT
+    spectrum : valeurs complexes de la FFT, ou max par classe (spectrum_summary)
+    mean : moyenne par classe (spectrum_summary) ou None
     """
     plt.figure(figsize=(8, 4))
-    plt.plot(freqs, np.abs(spectrum))
+    if mean is None:
+        plt.plot(freqs, np.abs(spectrum))
+    else:
+        plt.plot(freqs, np.abs(spectrum), label="max", alpha=0.6)
+        plt.plot(freqs, mean, label="moyenne")
+        plt.legend()
     plt.title("Spectre FFT")
     plt.xlabel("Fréquence (Hz)")
     plt.ylabel("|FFT|")
@@ -34,14 +188,18 @@ def plot_fft(freqs, spectrum):
     return plt.gcf()
 
 
-def plot_montecarlo_results(results):
+def plot_montecarlo_results(results, bands=None):
     """
     results : dict {distance: puissance_moyenne}
+    bands : dict {distance: (bas, haut)} ou None (bande de confiance)
     """
     L = np.array(list(results.keys()))
     P = np.array(list(results.values()))
 
     plt.figure(figsize=(6, 4))
+    if bands is not None:
+        low, high = np.array([bands[d] for d in results]).T
+        plt.fill_between(L, low, high, alpha=0.3, label="Intervalle de confiance")
     plt.plot(L, P, marker="o")
     plt.xlabel("Distance (D)")
     plt.ylabel("Puissance moyenne")
@@ -86,4 +244,22 @@ def plot_spectrogram(f, t, Sxx, title="Spectrogramme"):
     cbar = plt.colorbar()
     cbar.set_label("Amplitude")
     plt.tight_layout()
-    return plt.gcf()
\ No newline at end of file
+    return plt.gcf()
+
+
+def update_spectrogram(fig, f, t, Sxx):
+    """
+    Met à jour en place une figure créée par `plot_spectrogram` (mêmes
+    dimensions f x t), échelle de couleur comprise. Renvoie False si la
+    figure ne convient pas.
+    """
+    from matplotlib.collections import QuadMesh
+
+    meshes = [c for c in fig.axes[0].collections if isinstance(c, QuadMesh)] if fig.axes else []
+    if len(meshes) != 1 or meshes[0].get_array().shape != np.shape(Sxx):
+        return False
+
+    mesh = meshes[0]
+    mesh.set_array(Sxx)
+    mesh.set_clim(np.min(Sxx), np.max(Sxx))
+    return True
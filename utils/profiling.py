@@ -0,0 +1,201 @@
+"""
+Instrumentation légère des points chauds de l'analyse.
+
+Désactivée par défaut : une fonction décorée par `instrument` ne coûte
+alors qu'un test de booléen. Une fois activée (`enable()`, ou variable
+d'environnement WINDLAB_PROFILE=1 / "cprofile" / "memory"), chaque appel
+est chronométré et compté ; en option, le premier niveau d'appel est passé
+sous cProfile et le pic mémoire est relevé avec tracemalloc.
+
+`summary()` donne le bilan de la session (dict sérialisable en JSON),
+`dump_json(path)` l'écrit sur disque.
+
+Les appels exécutés dans d'autres processus (pools de processus) ne sont
+pas comptés : seuls ceux du processus courant, tous threads confondus.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_enabled = False
+_profile = False
+_memory = False
+
+_lock = threading.Lock()
+_local = threading.local()
+_timings = {}           # nom -> [appels, total (s), max (s), pic mémoire (octets)]
+_profiler_stats = None  # pstats.Stats cumulées
+
+
+def enable(profile=False, memory=False):
+    """Active l'instrumentation (cProfile et tracemalloc en option)."""
+    global _enabled, _profile, _memory
+    _enabled, _profile, _memory = True, profile, memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    global _enabled, _profile, _memory
+    if _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = _profile = _memory = False
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    global _profiler_stats
+    with _lock:
+        _timings.clear()
+        _profiler_stats = None
+
+
+def _record(name, seconds, peak=0):
+    with _lock:
+        entry = _timings.setdefault(name, [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        entry[3] = max(entry[3], peak)
+
+
+def _merge_profile(prof):
+    global _profiler_stats
+    with _lock:
+        if _profiler_stats is None:
+            _profiler_stats = pstats.Stats(prof)
+        else:
+            _profiler_stats.add(prof)
+
+
+def _call(name, fn, args, kwargs):
+    depth = getattr(_local, "depth", 0)
+    outermost = depth == 0
+    _local.depth = depth + 1
+
+    if _memory and outermost and tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+    prof = cProfile.Profile() if (_profile and outermost) else None
+    t = time.perf_counter()
+    try:
+        if prof is not None:
+            try:
+                return prof.runcall(fn, *args, **kwargs)
+            finally:
+                _merge_profile(prof)
+        return fn(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - t
+        peak = 0
+        if _memory and outermost and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1] - base, 0)
+        _local.depth = depth
+        _record(name, seconds, peak)
+
+
+def instrument(name=None):
+    """Décorateur : chronomètre la fonction quand l'instrumentation est active."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return _call(label, fn, args, kwargs)
+
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def timer(name):
+    """Chronomètre un bloc de code arbitraire (`with timer("pdf.layout"): ...`)."""
+    if not _enabled:
+        yield
+        return
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - t)
+
+
+def summary(top=20):
+    """Bilan de la session : temps par fonction instrumentée, et profil cProfile."""
+    with _lock:
+        timings = {
+            name: {
+                "calls": calls,
+                "total_s": total,
+                "mean_s": total / calls,
+                "max_s": worst,
+                **({"peak_mb": peak / 2**20} if _memory else {}),
+            }
+            for name, (calls, total, worst, peak) in sorted(
+                _timings.items(), key=lambda item: -item[1][1])
+        }
+        stats = _profiler_stats
+
+    result = {"timings": timings}
+    if stats is not None:
+        result["profile"] = [
+            {
+                "function": f"{path}:{line}({func})",
+                "calls": nc,
+                "tottime_s": tt,
+                "cumtime_s": ct,
+            }
+            for (path, line, func), (cc, nc, tt, ct, callers) in sorted(
+                stats.stats.items(), key=lambda item: -item[1][3])[:top]
+        ]
+    return result
+
+
+def format_summary(top=20):
+    """Bilan lisible (texte) pour la GUI ou la console."""
+    data = summary(top)
+    if not data["timings"]:
+        return "Aucune mesure (instrumentation désactivée ou aucun appel)."
+
+    lines = [f"{'fonction':50s} {'appels':>7s} {'total (s)':>10s} {'max (s)':>9s}"]
+    for name, t in data["timings"].items():
+        line = f"{name:50s} {t['calls']:7d} {t['total_s']:10.3f} {t['max_s']:9.3f}"
+        if "peak_mb" in t:
+            line += f" {t['peak_mb']:8.1f} Mo"
+        lines.append(line)
+
+    if "profile" in data:
+        buf = io.StringIO()
+        with _lock:
+            stats = pstats.Stats(stream=buf)
+            stats.add(_profiler_stats)
+        stats.sort_stats("cumulative").print_stats(top)
+        lines += ["", buf.getvalue()]
+    return "\n".join(lines)
+
+
+def dump_json(path, top=50):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary(top), f, indent=2)
+    return path
+
+
+# Activation par variable d'environnement : WINDLAB_PROFILE=1, "cprofile", "memory"
+# ou une combinaison séparée par des virgules ("cprofile,memory").
+_env = os.environ.get("WINDLAB_PROFILE", "")
+if _env and _env != "0":
+    _modes = set(_env.lower().split(","))
+    enable(profile="cprofile" in _modes, memory="memory" in _modes)
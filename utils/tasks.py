@@ -0,0 +1,150 @@
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+
+class TaskCancelled(Exception):
+    """Levée dans un calcul dont la tâche a été annulée."""
+
+
+class Task:
+    """
+    Tâche de fond. Le calcul reçoit `task.progress` comme callback de
+    progression (done, total) : c'est là qu'une annulation interrompt le calcul.
+    """
+
+    def __init__(self, key, events):
+        self.key = key
+        self._events = events
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def progress(self, done, total):
+        if self.cancelled:
+            raise TaskCancelled(self.key)
+        self._events.put(("progress", self, (done, total)))
+
+
+class TaskScheduler:
+    """
+    Couche entre l'interface Tk et les modules de calcul.
+
+    - les calculs tournent dans un pool de threads (numpy/scipy libèrent le GIL ;
+      les modules qui parallélisent déjà le font dans leurs propres processus)
+    - les résultats et la progression reviennent au thread Tk par une file,
+      relevée périodiquement avec `after()` : les callbacks s'exécutent dans Tk
+    - une seule tâche active par clé : soumettre une nouvelle tâche "fft"
+      annule la précédente, dont le résultat (périmé) est ignoré
+    """
+
+    def __init__(self, widget, max_workers=2, poll_ms=50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._events = queue.Queue()
+        self._active = {}
+        self._callbacks = {}
+        self.widget.after(self.poll_ms, self._poll)
+
+    def submit(self, key, job, on_done=None, on_error=None, on_progress=None):
+        """
+        Lance job(progress) en arrière-plan. `on_done(result)`,
+        `on_error(exc)` et `on_progress(done, total)` sont appelés dans Tk.
+        """
+        self.cancel(key)
+        task = Task(key, self._events)
+        self._active[key] = task
+        self._callbacks[task] = (on_done, on_error, on_progress)
+
+        def run():
+            try:
+                result = job(task.progress)
+            except TaskCancelled:
+                self._events.put(("cancelled", task, None))
+            except Exception as exc:
+                self._events.put(("error", task, exc))
+            else:
+                self._events.put(("done", task, result))
+
+        self._executor.submit(run)
+        return task
+
+    def cancel(self, *keys):
+        """Annule les tâches des clés données (toutes si aucune clé)."""
+        for key in keys or list(self._active):
+            task = self._active.pop(key, None)
+            if task is not None:
+                task.cancel()
+
+    def running(self, key=None):
+        if key is None:
+            return bool(self._active)
+        return key in self._active
+
+    def _poll(self):
+        try:
+            while True:
+                kind, task, payload = self._events.get_nowait()
+                self._dispatch(kind, task, payload)
+        except queue.Empty:
+            pass
+        self.widget.after(self.poll_ms, self._poll)
+
+    def _dispatch(self, kind, task, payload):
+        on_done, on_error, on_progress = self._callbacks.get(task, (None, None, None))
+        if kind != "progress":
+            self._callbacks.pop(task, None)
+            if self._active.get(task.key) is task:
+                del self._active[task.key]
+
+        # Résultat périmé : la tâche a été annulée ou remplacée entre-temps
+        if task.cancelled:
+            return
+
+        if kind == "progress" and on_progress is not None:
+            on_progress(*payload)
+        elif kind == "done" and on_done is not None:
+            on_done(payload)
+        elif kind == "error" and on_error is not None:
+            on_error(payload)
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_tasks(task, tasks, workers=None, progress=None):
+    """
+    Exécute task(args) -> (run_id, résultat) pour chaque élément de `tasks`,
+    un processus par tâche (en ligne si workers == 1). Renvoie {run_id: résultat}.
+    """
+    results = {}
+    if workers == 1:
+        for args in tasks:
+            run_id, res = task(args)
+            results[run_id] = res
+            if progress is not None:
+                progress(len(results), len(tasks))
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = []
+        try:
+            futures = [pool.submit(task, args) for args in tasks]
+            for fut in as_completed(futures):
+                run_id, res = fut.result()
+                results[run_id] = res
+                if progress is not None:
+                    progress(len(results), len(tasks))
+        finally:
+            # Sur erreur ou annulation (progress qui lève), les tâches pas
+            # encore démarrées sont annulées et on n'attend pas les autres
+            for fut in futures:
+                fut.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+    return results